@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared helpers for the daily solutions.
+"""
+
+
+import os
+
+if os.environ.get('AOC_INSTRUMENT'):
+    from aoc import instrument  # starts what it asks for, see aoc.instrument
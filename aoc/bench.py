@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the daily solutions.
+
+    python3 -m aoc.bench [DAY ...] [--repeat N] [--scale K ...] [--history FILE] [--no-cache]
+
+Every day is run on its committed input and on synthetic inputs scaled
+up K times (for the days aoc.synth knows how to generate). Days exposing
+parse(), part1() and part2() are timed part by part, the others as a
+whole script. Wall time, CPU time and tracemalloc peak of every
+measurement are appended as JSON lines to the history file and compared
+with the last measurement recorded for a different commit. The parse
+part is always timed from scratch; the data handed to the other parts
+comes from aoc.cache unless --no-cache is given.
+"""
+
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aoc import cache, days, synth
+from aoc.inputs import INPUT_DIR_VARIABLE
+
+
+HISTORY = os.path.join(days.ROOT, 'bench_history.jsonl')
+COMMITTED = 'committed'
+REGRESSION_THRESHOLD = 1.1
+
+
+def commit_id() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=days.ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[io.StringIO]:
+    """
+    Swallow what the solutions print, and feed an empty stdin
+    to the ones asking for confirmations.
+    """
+    output = io.StringIO()
+    stdin = sys.stdin
+    sys.stdin = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            yield output
+    finally:
+        sys.stdin = stdin
+
+
+@contextlib.contextmanager
+def input_dir(directory: Optional[str]) -> Iterator[None]:
+    previous = os.environ.get(INPUT_DIR_VARIABLE)
+    if directory:
+        os.environ[INPUT_DIR_VARIABLE] = directory
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(INPUT_DIR_VARIABLE, None)
+        else:
+            os.environ[INPUT_DIR_VARIABLE] = previous
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Run func repeat times for the timings, then once more
+    under tracemalloc for the memory peak.
+    """
+    walls, cpus = [], []
+    for n in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'repeat': repeat,
+        'wall': min(walls),
+        'wall_mean': sum(walls) / repeat,
+        'cpu': min(cpus),
+        'peak': peak,
+        'answer': None if result is None else str(result),
+    }
+
+
+def api_tasks(
+        day: int,
+        path: Optional[str],
+        use_cache: bool = True
+) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    module = days.load(day)
+    yield 'parse', lambda: module.parse(path)
+    with quiet():
+        data = cache.cached_parse(module, path) if use_cache else module.parse(path)
+    yield 'part1', lambda: module.part1(data)
+    yield 'part2', lambda: module.part2(data)
+
+
+def script_tasks(day: int) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    script = days.script_path(day)
+
+    def run() -> str:
+        if days.day_dir(day) not in sys.path:
+            sys.path.insert(0, days.day_dir(day))
+        with quiet() as output:
+            runpy.run_path(script, run_name='__main__')
+        lines = output.getvalue().strip().splitlines()
+        return lines[-1] if lines else ''
+
+    yield 'script', run
+
+
+def bench_day(
+        day: int,
+        label: str,
+        path: Optional[str],
+        repeat: int,
+        use_cache: bool = True
+) -> Iterator[Dict[str, Any]]:
+    if days.has_api(day):
+        tasks = api_tasks(day, path, use_cache)
+    else:
+        tasks = script_tasks(day)
+    with input_dir(os.path.dirname(path) if label != COMMITTED else None):
+        while True:
+            record = {'day': day, 'input': label}
+            try:
+                part, func = next(tasks)
+                record['part'] = part
+                with quiet():
+                    record.update(measure(func, repeat))
+            except StopIteration:
+                return
+            except (Exception, SystemExit) as exc:
+                record.setdefault('part', '?')
+                record['error'] = f'{type(exc).__name__}: {exc}'
+                yield record
+                return
+            yield record
+
+
+def inputs_for(day: int, scales: Sequence[int], directory: str) -> Iterator[Tuple[str, Optional[str]]]:
+    yield COMMITTED, days.default_input(day)
+    for scale in scales:
+        scale_dir = os.path.join(directory, f'x{scale}')
+        os.makedirs(scale_dir, exist_ok=True)
+        path = synth.write_synthetic(day, scale, scale_dir)
+        if path:
+            yield f'x{scale}', path
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return [json.loads(line) for line in fh if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def previous_record(
+        history: Sequence[Dict[str, Any]],
+        record: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    key = (record['day'], record['part'], record['input'])
+    for old in reversed(history):
+        if (old['day'], old['part'], old['input']) == key \
+                and old['commit'] != record['commit'] and 'error' not in old:
+            return old
+    return None
+
+
+def format_record(record: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> str:
+    head = f"day{record['day']:<3} {record['part']:<7} {record['input']:<10}"
+    if 'error' in record:
+        return f"{head} {record['error']}"
+    line = (f"{head} {record['wall']*1000:>10.2f} {record['cpu']*1000:>10.2f} "
+            f"{record['peak']/1024:>11.1f}")
+    if previous:
+        ratio = record['wall'] / previous['wall'] if previous['wall'] else 1
+        flag = '  !' if ratio > REGRESSION_THRESHOLD else ''
+        line += f"  {ratio:>6.2f}x vs {previous['commit']}{flag}"
+    return line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('days', nargs='*', type=int, help="days to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per part")
+    parser.add_argument('--scale', type=int, nargs='*', default=[4],
+                        help="scale factors of the synthetic inputs")
+    parser.add_argument('--history', default=HISTORY, help="JSON lines history file")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse the inputs for the parts instead of using aoc.cache")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error(f"--repeat must be at least 1, not {args.repeat}")
+
+    history = load_history(args.history)
+    common = {
+        'commit': commit_id(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+    }
+    print(f"{'day':<6} {'part':<7} {'input':<10} {'wall(ms)':>10} {'cpu(ms)':>10} {'peak(KiB)':>11}")
+    with tempfile.TemporaryDirectory(prefix='aoc-bench-') as directory, \
+            open(args.history, 'a', encoding='utf-8') as out:
+        for day in args.days or days.discover():
+            if not days.script_path(day):
+                print(f"day{day:<3} no solution")
+                continue
+            for label, path in inputs_for(day, args.scale, directory):
+                for record in bench_day(day, label, path, args.repeat, not args.no_cache):
+                    record = {**common, **record}
+                    print(format_record(record, previous_record(history, record)), flush=True)
+                    out.write(json.dumps(record) + '\n')
+                    out.flush()
+
+
+if __name__ == '__main__':
+    main()
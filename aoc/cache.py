@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache of the parsed inputs, keyed on the content of the input file.
+
+The parsed data is pickled under AOC_CACHE_DIR (default: .parse_cache
+in the repository root) in a file named after the solution module, the
+hash of the input and the hash of the solution's source, so editing
+either of them invalidates the entry. Inputs parsed to their own path
+(too big to be read at once) aren't cached: the file may move.
+"""
+
+
+import hashlib
+import os
+import pickle
+import tempfile
+from types import ModuleType
+from typing import Any, Optional
+
+from aoc.inputs import MappedInput, input_path
+
+
+CACHE_DIR_VARIABLE = 'AOC_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.parse_cache')
+
+
+def cache_dir() -> str:
+    return os.environ.get(CACHE_DIR_VARIABLE) or DEFAULT_CACHE_DIR
+
+
+def file_digest(path: str) -> str:
+    with MappedInput(path) as input_:
+        return hashlib.sha256(input_.buffer).hexdigest()
+
+
+def cache_path(module: ModuleType, path: str) -> str:
+    key = hashlib.sha256()
+    key.update(file_digest(path).encode())
+    key.update(file_digest(module.__file__).encode())
+    return os.path.join(cache_dir(), f'{module.__name__}-{key.hexdigest()}.pickle')
+
+
+def load(cached: str) -> Any:
+    with open(cached, 'rb') as fh:
+        return pickle.load(fh)
+
+
+def store(cached: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(cached), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cached)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def cached_parse(module: ModuleType, path: Optional[str] = None) -> Any:
+    """
+    module.parse(path), reloaded from the cache when the same input
+    has already been parsed by the same code.
+    Days without an input file are just parsed.
+    """
+    source = path or input_path(module.__file__)
+    if not os.path.isfile(source):
+        return module.parse(path)
+    cached = cache_path(module, source)
+    try:
+        return load(cached)
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError):
+        pass  # stale or corrupted entry: parse again
+    data = module.parse(path)
+    if isinstance(data, str) and data == source:
+        return data
+    try:
+        store(cached, data)
+    except (pickle.PicklingError, TypeError, RecursionError, OSError):
+        pass  # not everything can be pickled: then it just doesn't get cached
+    return data
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Discovery and loading of the daily solutions.
+"""
+
+
+import ast
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import List, Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAYS = range(1, 26)
+API = ('parse', 'part1', 'part2')
+
+
+def day_dir(day: int) -> str:
+    return os.path.join(ROOT, f'day{day}')
+
+
+def script_path(day: int) -> Optional[str]:
+    path = os.path.join(day_dir(day), f'day{day}.py')
+    return path if os.path.isfile(path) else None
+
+
+def default_input(day: int) -> Optional[str]:
+    path = os.path.join(day_dir(day), f'input_day{day}.txt')
+    return path if os.path.isfile(path) else None
+
+
+def discover() -> List[int]:
+    """
+    Days having a solution script.
+    """
+    return [day for day in DAYS if script_path(day)]
+
+
+def has_api(day: int) -> bool:
+    """
+    True if the script defines parse(), part1() and part2() at top level.
+    Checked on the source, since importing a script without
+    them would run the whole solution.
+    """
+    path = script_path(day)
+    if not path:
+        return False
+    with open(path, encoding='utf-8') as fh:
+        tree = ast.parse(fh.read(), path)
+    defined = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+    return all(name in defined for name in API)
+
+
+def load(day: int) -> ModuleType:
+    """
+    Import dayN/dayN.py as module dayN. The day directory is put
+    on sys.path so that sibling modules (e.g. day23's nanobot) resolve.
+    """
+    name = f'day{day}'
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+    directory = day_dir(day)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, script_path(day))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Memory-mapped access to the puzzle inputs.
+
+The file is never read as a whole: lines, integer tokens and grid rows
+are sliced out of the mapping on demand, so even a multi-GB generated
+input costs (almost) nothing more than the pages actually touched.
+"""
+
+
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional
+
+
+INT_TOKEN = re.compile(rb'-?\d+')
+INPUT_DIR_VARIABLE = 'AOC_INPUT_DIR'
+
+
+def input_path(script: str, name: Optional[str] = None) -> str:
+    """
+    Path of an input file living in the same directory as script
+    (usually the __file__ of a solution). Default name is input_dayN.txt.
+    If the AOC_INPUT_DIR environment variable is set and holds a file
+    with the same name, that one is used instead (see aoc.bench).
+    """
+    directory = os.path.dirname(os.path.abspath(script))
+    if name is None:
+        name = f'input_{os.path.basename(directory)}.txt'
+    override = os.environ.get(INPUT_DIR_VARIABLE)
+    if override and os.path.isfile(os.path.join(override, name)):
+        return os.path.join(override, name)
+    return os.path.join(directory, name)
+
+
+class MappedInput:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            self._map = b''
+        self._view = memoryview(self._map)
+
+    def __enter__(self) -> 'MappedInput':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    @property
+    def closed(self) -> bool:
+        return self._fh.closed
+
+    def close(self) -> None:
+        """
+        Close the file. Views handed out by byte_lines() or grid() can
+        outlive the input: while any of them is alive the mapping can't
+        be unmapped, so it is left to them and unmapped with the last one.
+        """
+        self._fh.close()
+        try:
+            self._view.release()
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+        except BufferError:  # exported views still alive
+            pass
+        self._view = memoryview(b'')
+        self._map = b''
+
+    @property
+    def buffer(self) -> memoryview:
+        return self._view
+
+    def text(self) -> str:
+        """
+        The whole decoded content, for the few solutions
+        that really need it in one piece.
+        """
+        return str(self._view, 'utf-8')
+
+    def spans(self, skip_empty: bool = True) -> Iterator[slice]:
+        """
+        Slices delimiting every line in the mapping, newline excluded.
+        """
+        find = self._map.find
+        start = 0
+        end = len(self._map)
+        while start < end:
+            stop = find(b'\n', start)
+            if stop == -1:
+                stop = end
+            line_end = stop
+            if line_end > start and self._map[line_end-1] == 0x0d:  # '\r'
+                line_end -= 1
+            if line_end > start or not skip_empty:
+                yield slice(start, line_end)
+            start = stop + 1
+
+    def byte_lines(self, skip_empty: bool = True) -> Iterator[memoryview]:
+        """
+        Zero-copy views of every line, still valid after the input is closed.
+        """
+        view = self._view
+        for span in self.spans(skip_empty):
+            yield view[span]
+
+    def lines(self, skip_empty: bool = True) -> Iterator[str]:
+        view = self._view
+        for span in self.spans(skip_empty):
+            yield str(view[span], 'utf-8')
+
+    def ints(self) -> Iterator[int]:
+        """
+        Every (possibly negative) integer in the file, in order.
+        """
+        for match in INT_TOKEN.finditer(self._map):
+            yield int(match.group())
+
+    def grid(self) -> 'Grid':
+        return Grid(self)
+
+
+class Grid:
+    """
+    Read-only byte grid over the lines of a MappedInput.
+    Only the offsets of the rows are stored: grid[y] is a memoryview
+    of row y and grid[y][x] the byte value of the cell.
+    """
+
+    def __init__(self, source: MappedInput) -> None:
+        self._view = source.buffer
+        self._rows = [(span.start, span.stop) for span in source.spans()]
+        self.height = len(self._rows)
+        self.width = max((stop - start for start, stop in self._rows), default=0)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        start, stop = self._rows[y]
+        return self._view[start:stop]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for y in range(self.height):
+            yield self[y]
+
+    def cell(self, x: int, y: int) -> str:
+        return chr(self[y][x])
+
+    def to_lists(self) -> List[List[str]]:
+        """
+        Mutable copy, in the list of lists of characters shape
+        used by the simulations.
+        """
+        return [list(str(row, 'utf-8')) for row in self]
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentation of the daily solutions.
+
+    python3 -m aoc.instrument DAY [--part PART ...] [--profile cprofile|tracemalloc]
+                                  [--top N] [--json FILE]
+
+The solutions keep named counters, timers and peaks in their main loops
+(e.g. interpreter instructions in Device.execute, nodes expanded in
+Unit.move, paths alive in Climber.step). They are collected only when
+instrumentation is enabled, by this command or by the environment:
+
+    AOC_INSTRUMENT=counters|cprofile|tracemalloc python3 dayN/dayN.py
+
+collects the counters (and profiles the whole run with the given
+profiler) for any script importing the aoc package, and dumps them as
+JSON at exit on stderr, or in the file named by AOC_INSTRUMENT_JSON.
+This command runs the chosen parts one by one, each wrapped in the
+chosen profiler, and writes everything as JSON to FILE (or stdout).
+"""
+
+
+import argparse
+import atexit
+import collections
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO
+
+
+ENV_VARIABLE = 'AOC_INSTRUMENT'
+JSON_VARIABLE = 'AOC_INSTRUMENT_JSON'
+PROFILERS = ('cprofile', 'tracemalloc')
+TOP = 20
+
+enabled = bool(os.environ.get(ENV_VARIABLE))
+
+counters: Dict[str, int] = collections.Counter()
+timers: Dict[str, float] = collections.defaultdict(float)
+peaks: Dict[str, int] = {}
+
+
+def count(name: str, n: int = 1) -> None:
+    if enabled:
+        counters[name] += n
+
+
+def peak(name: str, value: int) -> None:
+    if enabled and value > peaks.get(name, value - 1):
+        peaks[name] = value
+
+
+@contextlib.contextmanager
+def timer(name: str) -> Iterator[None]:
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timers[name] += time.perf_counter() - start
+
+
+def reset() -> None:
+    counters.clear()
+    timers.clear()
+    peaks.clear()
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Counters, timers and peaks collected so far. A counter named
+    after a timer plus a suffix (day19.execute.instructions for
+    timer day19.execute) also gets its rate per second.
+    """
+    rates = {}
+    for name, value in counters.items():
+        timer_name = name.rpartition('.')[0]
+        if timers.get(timer_name):
+            rates[f'{name}/s'] = value / timers[timer_name]
+    return {
+        'counters': dict(counters),
+        'timers': dict(timers),
+        'peaks': dict(peaks),
+        'rates': rates,
+    }
+
+
+def cprofile_stats(profile: cProfile.Profile, top: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    entries = []
+    for func in stats.fcn_list[:top]:
+        calls, primitive, tottime, cumtime, callers = stats.stats[func]
+        filename, line, name = func
+        entries.append({
+            'function': f'{os.path.relpath(filename)}:{line}({name})' if line else name,
+            'calls': calls,
+            'tottime': tottime,
+            'cumtime': cumtime,
+        })
+    return entries
+
+
+def tracemalloc_stats(snapshot_: tracemalloc.Snapshot, top: int) -> List[Dict[str, Any]]:
+    return [
+        {'line': str(stat.traceback), 'size': stat.size, 'count': stat.count}
+        for stat in snapshot_.statistics('lineno')[:top]
+    ]
+
+
+def profiled(func: Callable[[], Any], profiler: Optional[str], top: int) -> Dict[str, Any]:
+    """
+    Run func, under the given profiler if any, and return
+    its answer, wall time, counters and profile.
+    """
+    global enabled
+    enabled = True
+    reset()
+    result = {}
+    start = time.perf_counter()
+    if profiler == 'cprofile':
+        profile = cProfile.Profile()
+        answer = profile.runcall(func)
+        result['profile'] = cprofile_stats(profile, top)
+    elif profiler == 'tracemalloc':
+        tracemalloc.start()
+        try:
+            answer = func()
+            memory = tracemalloc.take_snapshot()
+            result['peak'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        result['profile'] = tracemalloc_stats(memory, top)
+    else:
+        answer = func()
+    result['wall'] = time.perf_counter() - start
+    result['answer'] = None if answer is None else str(answer)
+    result.update(snapshot())
+    return result
+
+
+def write_json(report: Dict[str, Any], path: Optional[str], stream: Optional[TextIO] = None) -> None:
+    output = json.dumps(report, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(output + '\n')
+    else:
+        print(output, file=stream or sys.stdout)
+
+
+def from_environment() -> None:
+    """
+    Start what AOC_INSTRUMENT asks for, with a dump of the results at exit.
+    """
+    mode = os.environ.get(ENV_VARIABLE)
+    if not mode:
+        return
+    profile = None
+    if mode == 'cprofile':
+        profile = cProfile.Profile()
+        profile.enable()
+    elif mode == 'tracemalloc':
+        tracemalloc.start()
+
+    def dump() -> None:
+        report = snapshot()
+        if profile:
+            profile.disable()
+            report['profile'] = cprofile_stats(profile, TOP)
+        elif tracemalloc.is_tracing():
+            report['peak'] = tracemalloc.get_traced_memory()[1]
+            report['profile'] = tracemalloc_stats(tracemalloc.take_snapshot(), TOP)
+            tracemalloc.stop()
+        write_json(report, os.environ.get(JSON_VARIABLE), sys.stderr)
+
+    atexit.register(dump)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from aoc import bench, days
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('day', type=int)
+    parser.add_argument('--part', nargs='*', choices=('parse', 'part1', 'part2'),
+                        default=['parse', 'part1', 'part2'], help="parts to run")
+    parser.add_argument('--profile', choices=PROFILERS, help="profiler wrapping every part")
+    parser.add_argument('--top', type=int, default=TOP, help="profile entries to keep")
+    parser.add_argument('--input', help="input file (default: the committed one)")
+    parser.add_argument('--json', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if not days.has_api(args.day):
+        parser.error(f"day {args.day} doesn't expose parse(), part1() and part2()")
+    module = days.load(args.day)
+    with bench.quiet():
+        data = module.parse(args.input)
+    report = {'day': args.day, 'input': args.input or bench.COMMITTED, 'parts': {}}
+    for part in args.part:
+        if part == 'parse':
+            func = lambda: module.parse(args.input)
+        else:
+            func = lambda: getattr(module, part)(data)
+        with bench.quiet():
+            report['parts'][part] = profiled(func, args.profile, args.top)
+    write_json(report, args.json)
+
+
+if __name__ == '__main__':
+    # the solutions update the counters of the imported module, not of __main__
+    from aoc.instrument import main
+    main()
+else:
+    from_environment()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Process pool helpers shared by the solutions and the runner.
+"""
+
+
+import multiprocessing
+import os
+from typing import Callable, Iterable, List, TypeVar
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on every platform
+        return os.cpu_count() or 1
+
+
+def pool_map(func: Callable[[T], R], iterable: Iterable[T]) -> List[R]:
+    """
+    map() over a pool with one process per available cpu. Inside a pool
+    worker (e.g. when the day runs under aoc.runner, which already keeps
+    every cpu busy) daemonic processes can't have children, so it just
+    maps in the current process.
+    """
+    if multiprocessing.current_process().daemon:
+        return list(map(func, iterable))
+    with multiprocessing.Pool(cpu_count()) as p:
+        return p.map_async(func, iterable).get()
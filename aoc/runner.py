@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Run the daily solutions in parallel.
+
+    python3 -m aoc.runner [DAY ...] [--processes N] [--history FILE] [--no-cache]
+
+Every part of every day is a task for one shared process pool. Tasks are
+handed out longest-expected-first, according to the timings recorded by
+aoc.bench (the ones never measured go first), so the whole run takes
+about as long as its slowest part. A consolidated report follows.
+Parsed inputs are reused from aoc.cache unless --no-cache is given.
+"""
+
+
+import argparse
+import contextlib
+import functools
+import io
+import multiprocessing
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aoc import bench, cache, days
+from aoc.parallel import cpu_count
+
+
+PARTS = ('part1', 'part2')
+
+Task = Tuple[int, str]
+
+
+def expected_durations(history: Iterable[Dict[str, Any]]) -> Dict[Task, float]:
+    """
+    Last recorded time of parsing plus solving for every (day, part)
+    on the committed input.
+    """
+    walls = {}
+    for record in history:
+        if record['input'] == bench.COMMITTED and 'error' not in record:
+            walls[(record['day'], record['part'])] = record['wall']
+    durations = {}
+    for (day, part), wall in walls.items():
+        if part in PARTS:
+            durations[(day, part)] = wall + walls.get((day, 'parse'), 0)
+    return durations
+
+
+def schedule(tasks: Iterable[Task], durations: Dict[Task, float]) -> List[Task]:
+    return sorted(tasks, key=lambda task: durations.get(task, float('inf')), reverse=True)
+
+
+def run_task(task: Task, use_cache: bool = True) -> Dict[str, Any]:
+    day, part = task
+    result = {'day': day, 'part': part}
+    start = time.perf_counter()
+    try:
+        module = days.load(day)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = cache.cached_parse(module) if use_cache else module.parse()
+            result['answer'] = getattr(module, part)(data)
+    except Exception as exc:
+        result['error'] = f'{type(exc).__name__}: {exc}'
+    result['wall'] = time.perf_counter() - start
+    return result
+
+
+def run(
+        tasks: Sequence[Task],
+        processes: int,
+        use_cache: bool = True
+) -> Tuple[List[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    results = []
+    worker = functools.partial(run_task, use_cache=use_cache)
+    with multiprocessing.Pool(processes) as pool:
+        for result in pool.imap_unordered(worker, tasks, chunksize=1):
+            results.append(result)
+            status = 'error' if 'error' in result else f"{result['wall']:.2f}s"
+            print(f"day{result['day']} {result['part']}: {status}", file=sys.stderr, flush=True)
+    return results, time.perf_counter() - start
+
+
+def report(results: Sequence[Dict[str, Any]], elapsed: float) -> None:
+    by_task = {(result['day'], result['part']): result for result in results}
+    multiline = []
+    print(f"{'day':<6} {'part1':<28} {'part2':<28} {'time(s)':>8}")
+    for day in sorted({day for day, part in by_task}):
+        cells = []
+        total = 0
+        for part in PARTS:
+            result = by_task.get((day, part))
+            if not result:
+                cells.append('-')
+                continue
+            total += result['wall']
+            if 'error' in result:
+                cells.append(result['error'])
+            elif '\n' in str(result['answer']):
+                multiline.append((day, part, result['answer']))
+                cells.append('(see below)')
+            else:
+                cells.append(str(result['answer']))
+        print(f"day{day:<3} {cells[0]:<28} {cells[1]:<28} {total:>8.2f}")
+    for day, part, answer in multiline:
+        print(f"\nday{day} {part}:\n{answer}")
+    busy = sum(result['wall'] for result in results)
+    print(f"\nElapsed: {elapsed:.2f}s (sum of all the tasks: {busy:.2f}s)")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('days', nargs='*', type=int, help="days to run (default: all)")
+    parser.add_argument('--processes', type=int, default=cpu_count(), help="size of the pool")
+    parser.add_argument('--history', default=bench.HISTORY,
+                        help="aoc.bench history used to order the tasks")
+    parser.add_argument('--no-cache', action='store_true', help="always parse the inputs")
+    args = parser.parse_args(argv)
+
+    selected = [day for day in (args.days or days.discover()) if days.has_api(day)]
+    tasks = schedule(
+        ((day, part) for day in selected for part in PARTS),
+        expected_durations(bench.load_history(args.history))
+    )
+    results, elapsed = run(tasks, args.processes, not args.no_cache)
+    report(results, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Generators of scaled-up synthetic inputs, shaped like the committed ones.
+A generator receives the scale factor and a seeded random.Random and
+returns the text of the input file.
+"""
+
+
+import datetime
+import os
+import random
+import string
+from typing import Callable, Mapping, Optional
+
+
+def day1(scale: int, rng: random.Random) -> str:
+    changes = [rng.choice((-1, 1)) * rng.randint(1, 20) for n in range(1000 * scale)]
+    return "".join(f'{change:+d}\n' for change in changes)
+
+
+def day2(scale: int, rng: random.Random) -> str:
+    letters = string.ascii_lowercase
+    ids = [''.join(rng.choice(letters) for n in range(26)) for m in range(250 * scale)]
+    # exactly one pair of ids differing by one character
+    twin = list(ids[rng.randrange(len(ids))])
+    position = rng.randrange(len(twin))
+    twin[position] = letters[(letters.index(twin[position]) + 1) % len(letters)]
+    ids.insert(rng.randrange(len(ids)), ''.join(twin))
+    return "".join(f'{id_}\n' for id_ in ids)
+
+
+def day3(scale: int, rng: random.Random) -> str:
+    claims = []
+    for id_ in range(1, 1300 * scale + 1):
+        width, height = rng.randint(10, 29), rng.randint(10, 29)
+        x, y = rng.randint(0, 1000 - width), rng.randint(0, 1000 - height)
+        claims.append(f'#{id_} @ {x},{y}: {width}x{height}\n')
+    return "".join(claims)
+
+
+def day4(scale: int, rng: random.Random) -> str:
+    guards = [rng.randint(10, 3500) for n in range(20 * scale)]
+    lines = []
+    first_day = datetime.date(1518, 1, 1)
+    for day in range(360 * scale):
+        date = (first_day + datetime.timedelta(days=day)).isoformat()
+        lines.append(f'[{date} 00:00] Guard #{rng.choice(guards)} begins shift\n')
+        minute = rng.randint(1, 10)
+        while minute < 55:
+            wake_up = rng.randint(minute + 1, min(59, minute + 30))
+            lines.append(f'[{date} 00:{minute:02d}] falls asleep\n')
+            lines.append(f'[{date} 00:{wake_up:02d}] wakes up\n')
+            minute = wake_up + rng.randint(1, 20)
+    rng.shuffle(lines)
+    return "".join(lines)
+
+
+def day5(scale: int, rng: random.Random) -> str:
+    units = []
+    for n in range(50000 * scale):
+        unit = rng.choice(string.ascii_lowercase)
+        units.append(unit.upper() if rng.random() < 0.5 else unit)
+    return "".join(units)
+
+
+def day6(scale: int, rng: random.Random) -> str:
+    coords = {(rng.randint(40, 360), rng.randint(40, 360)) for n in range(50 * scale)}
+    return "".join(f'{x}, {y}\n' for x, y in sorted(coords, key=lambda c: rng.random()))
+
+
+def day8(scale: int, rng: random.Random) -> str:
+    # random tree, deep enough (depth about n / 2.5) to overflow the
+    # stack of a recursive parser: every node gets as parent one of the
+    # four nodes before it
+    nodes = 2000 * scale
+    children = [[] for n in range(nodes)]
+    for node in range(1, nodes):
+        children[rng.randrange(max(node - 4, 0), node)].append(node)
+    metadata = []
+    for node in range(nodes):
+        upper = len(children[node]) + 1 if children[node] else 9
+        metadata.append([rng.randint(1, upper) for n in range(rng.randint(1, 11))])
+    numbers = []
+    stack = [(0, False)]
+    while stack:
+        node, visited = stack.pop()
+        if visited:
+            numbers.extend(metadata[node])
+            continue
+        numbers.extend((len(children[node]), len(metadata[node])))
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children[node]))
+    return " ".join(str(number) for number in numbers) + "\n"
+
+
+def day25(scale: int, rng: random.Random) -> str:
+    points = []
+    for n in range(1200 * scale):
+        points.append(",".join(str(rng.randint(-8, 8)) for coord in range(4)))
+    return "".join(f'{point}\n' for point in points)
+
+
+GENERATORS: Mapping[int, Callable[[int, random.Random], str]] = {
+    1: day1,
+    2: day2,
+    3: day3,
+    4: day4,
+    5: day5,
+    6: day6,
+    8: day8,
+    25: day25,
+}
+
+
+def write_synthetic(day: int, scale: int, directory: str, seed: int = 2018) -> Optional[str]:
+    """
+    Write input_dayN.txt for the given scale into directory.
+    Returns its path, or None if there's no generator for the day.
+    """
+    try:
+        generator = GENERATORS[day]
+    except KeyError:
+        return None
+    path = os.path.join(directory, f'input_day{day}.txt')
+    with open(path, 'w', encoding='utf-8') as fh:
+        fh.write(generator(scale, random.Random(seed * 100 + day)))
+    return path
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
+
+def parse(path: Optional[str] = None) -> List[int]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return list(input_.ints())
+
+
+def frequencies(changes: Iterable[int]) -> Tuple[List[int], int]:
+    """
+    Frequencies reached during the first pass over the changes
+    (starting from 0) and the drift of every pass.
+    """
+    reached = [0]
+    for change in changes:
+        reached.append(reached[-1] + change)
+    drift = reached.pop()
+    return reached, drift
+
+
+def part1(changes: List[int]) -> int:
+    return sum(changes)
+
+
+def part2(changes: List[int]) -> int:
+    """
+    Pass k reaches reached[i] + k * drift at time k * len + i, so a
+    frequency of the first pass is reached again only by the ones
+    congruent to it modulo the drift, each one by the nearest of them
+    behind it in the direction of the drift. Grouping by residue and
+    sorting finds the first repetition without running the passes.
+    """
+    reached, drift = frequencies(changes)
+    seen = set()
+    for frequency in reached:
+        if frequency in seen:
+            return frequency
+        seen.add(frequency)
+    if not drift:
+        return reached[0]
+
+    residues: Dict[int, List[Tuple[int, int]]] = {}
+    for time, frequency in enumerate(reached):
+        try:
+            residues[frequency % drift].append((frequency, time))
+        except KeyError:
+            residues[frequency % drift] = [(frequency, time)]
+    first = None
+    for group in residues.values():
+        group.sort(reverse=drift < 0)
+        for (frequency, time), (target, _) in zip(group, group[1:]):
+            when = (target - frequency) // drift * len(reached) + time
+            if first is None or when < first[0]:
+                first = (when, target)
+    if first is None:
+        raise ValueError("No frequency is ever reached twice.")
+    return first[1]
+
+
+if __name__ == '__main__':
+    changes = parse()
+
+    print("Resulting frequency:", part1(changes))
+
+    print("First frequency reached twice:", part2(changes))
@@ -3,7 +3,12 @@
 
 
 import os
+import sys
 import re
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class Point:
@@ -31,7 +36,7 @@ def allnear(points: list) -> bool:
     return all(arenear)
 
 
-def printpoints(points: list) -> None: 
+def render(points: list) -> str:
     minx = min(points, key=lambda p: p.x).x
     miny = min(points, key=lambda p: p.y).y
     maxx = max(points, key=lambda p: p.x).x
@@ -40,33 +45,61 @@ def printpoints(points: list) -> None:
         field = [ ['.'] * (maxx - minx + 1) for n in range(maxy - miny + 1) ]
         for point in points:
             field[point.y - miny][point.x - minx] = '#'
-        for line in field:
-            print(" ".join(p for p in line))
+        return "\n".join(" ".join(p for p in line) for line in field)
+    return ''
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day10.txt'),
-            encoding='utf-8'
-        ) as fh:
-        lines = [line for line in fh.read().split('\n') if line]
+def printpoints(points: list) -> None:
+    print(render(points))
 
-    points = []
-    for line in lines:
-        match = re.search(r'<([ -]\d+), ([ -]\d+)> velocity=<([ -]\d+), ([ -]\d+)>', line)
-        position = (int(match.group(1)), int(match.group(2)))
-        velocity = (int(match.group(3)), int(match.group(4)))
-        points.append(Point(position, velocity))
 
+def align(points: list, skip: int = 10000) -> int:
+    """
+    Move the points until they are all near to each other
+    (not checking before skip seconds) and return the seconds passed.
+    """
     counter = 0
     while True:
         counter += 1
         for point in points:
             point.move()
-        if counter > 10000:
-            if allnear(points):
-                print("Seconds:", counter)
-                printpoints(points)
-                out = input("Do you want to exit now? (y/n) ")
-                if out == 'y':
-                    break
+        if counter > skip and allnear(points):
+            return counter
+
+
+def parse(path: Optional[str] = None) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """
+    Position and velocity of every point.
+    """
+    points = []
+    with MappedInput(path or input_path(__file__)) as input_:
+        for line in input_.lines():
+            match = re.search(r'<([ -]\d+), ([ -]\d+)> velocity=<([ -]\d+), ([ -]\d+)>', line)
+            position = (int(match.group(1)), int(match.group(2)))
+            velocity = (int(match.group(3)), int(match.group(4)))
+            points.append((position, velocity))
+    return points
+
+
+def part1(points_data: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> str:
+    points = [Point(position, velocity) for position, velocity in points_data]
+    align(points)
+    return render(points)
+
+
+def part2(points_data: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> int:
+    points = [Point(position, velocity) for position, velocity in points_data]
+    return align(points)
+
+
+if __name__ == '__main__':
+    points = [Point(position, velocity) for position, velocity in parse()]
+
+    counter = 0
+    while True:
+        counter = align(points, skip=counter)
+        print("Seconds:", counter)
+        printpoints(points)
+        out = input("Do you want to exit now? (y/n) ")
+        if out == 'y':
+            break
@@ -3,7 +3,12 @@
 
 
 import os
-from multiprocessing import Pool
+import sys
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput
+from aoc.parallel import pool_map
 
 
 def compute_largest(data):
@@ -31,9 +36,7 @@ def compute_largest(data):
     return largest
 
 
-if __name__ == '__main__':
-    serial_number = 7347
-
+def power_grid(serial_number: int) -> List[List[int]]:
     grid = [ [0] * 300 for n in range(300) ]
 
     for y, line in enumerate(grid, 1):
@@ -41,13 +44,42 @@ if __name__ == '__main__':
             rack_id = x + 10
             power_level = int(str(((rack_id * y) + serial_number) * rack_id)[-3]) - 5
             grid[y-1][x-1] = power_level
+    return grid
+
+
+def parse(path: Optional[str] = None) -> int:
+    """
+    Grid serial number (my puzzle's one if no input file is given).
+    """
+    if not path:
+        return 7347
+    with MappedInput(path) as input_:
+        return next(input_.ints())
+
+
+def part1(serial_number: int) -> str:
+    grid = power_grid(serial_number)
+    largest = max(
+        (sum(grid[y+dy][x+dx] for dy in range(3) for dx in range(3)), x, y)
+        for y in range(len(grid)-2) for x in range(len(grid)-2)
+    )
+    return f"{largest[1]+1},{largest[2]+1}"
 
+
+def part2(serial_number: int) -> str:
+    grid = power_grid(serial_number)
     args_for_child_procs = ((y, grid_) for y in range(len(grid)) for grid_ in (grid,))
-    with Pool(len(os.sched_getaffinity(0))) as p:
-        result = p.map_async(compute_largest, args_for_child_procs)
-        res_value = result.get()
-        largest_power = max(res_value, key=lambda p: p[1])
-
-    print(f"Region with largest power is "
-          f"{largest_power[0][0]},{largest_power[0][1]},"
-          f"{largest_power[0][2]}x{largest_power[0][2]}")
\ No newline at end of file
+    res_value = pool_map(compute_largest, args_for_child_procs)
+    largest_power = max(res_value, key=lambda p: p[1])
+
+    return (f"{largest_power[0][0]},{largest_power[0][1]},"
+            f"{largest_power[0][2]}")
+
+
+if __name__ == '__main__':
+    serial_number = parse()
+
+    print(f"Coordinates of the 3x3 square with largest power: {part1(serial_number)}")
+
+    x, y, size = part2(serial_number).split(',')
+    print(f"Region with largest power is {x},{y},{size}x{size}")
@@ -2,8 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 
 from itertools import dropwhile
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 def next_generation(states, pots, extremes):
@@ -35,31 +40,45 @@ def next_generation(states, pots, extremes):
     return stable
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day12.txt'),
-            encoding='utf-8'
-        ) as fh:
-        lines = [line for line in fh.read().split('\n') if line]
+def parse(path: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        lines = list(input_.lines())
     initial_state = lines[0][lines[0].index('#'):]
     states = {}
     for line in lines[1:]:
         rule = line.split(' => ')
         states[rule[0]] = rule[1]
+    return initial_state, states
+
 
+def grow(initial_state: str, states: Dict[str, str], generations: int) -> int:
+    """
+    Sum of the numbers of the pots containing plants after the given
+    generations. Once the pattern only shifts, the rest is extrapolated.
+    """
     pots = {}
     for i, c in enumerate(initial_state):
         pots[i] = c
 
     extremes = [0, i]
 
-    for generation in range(1, 50000000000):
+    for generation in range(1, generations+1):
         stable = next_generation(states, pots, extremes)
         #print(f"{generation}: ", "." * abs(extremes[0]), "".join(pots[i] for i in range(extremes[0], extremes[1]+1)), sep="")
-        if generation == 20:
-            total_sum_20th = sum(i for i, plant in pots.items() if plant == '#')
         if stable:
-            total_sum = sum(i + 50000000000 - generation for i, plant in pots.items() if plant == '#')
-            break
-    print("Sum of numbers of pots containing plants after 20 generations:", total_sum_20th)
-    print("Sum of numbers of pots containing plants after 50000000000 generations:", total_sum)
+            return sum(i + generations - generation for i, plant in pots.items() if plant == '#')
+    return sum(i for i, plant in pots.items() if plant == '#')
+
+
+def part1(data: Tuple[str, Dict[str, str]]) -> int:
+    return grow(*data, 20)
+
+
+def part2(data: Tuple[str, Dict[str, str]]) -> int:
+    return grow(*data, 50000000000)
+
+
+if __name__ == '__main__':
+    data = parse()
+    print("Sum of numbers of pots containing plants after 20 generations:", part1(data))
+    print("Sum of numbers of pots containing plants after 50000000000 generations:", part2(data))
@@ -3,7 +3,11 @@
 
 
 import os
-from typing import Union
+import sys
+from typing import List, Optional, Tuple, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class Cart:
@@ -95,30 +99,48 @@ def tick(carts: list) -> Union[tuple, None]:
     return first_crash
 
 
-def main() -> None:
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day13.txt'),
-            encoding='utf-8'
-        ) as fh:
-        Cart.track = [list(line) for line in fh.read().split('\n') if line]
+def parse(path: Optional[str] = None) -> List[str]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return list(input_.lines())
+
+
+def place_carts(track: List[str]) -> List[Cart]:
+    """
+    Put a fresh copy of the track under Cart.track
+    and return the carts found on it.
+    """
+    Cart.track = [list(line) for line in track]
 
     carts = []
     for i, y in enumerate(Cart.track):
         for j, x in enumerate(y):
             if x in Cart.directions:
                 carts.append(Cart((j, i), x))
+    return carts
+
 
+def part1(track: List[str]) -> Tuple[int, int]:
+    carts = place_carts(track)
     while True:
         first_crash = tick(carts)
         if first_crash:
-            break
-    print("Coordinates of first crash:", first_crash)
+            return first_crash
+
 
+def part2(track: List[str]) -> Tuple[int, int]:
+    carts = place_carts(track)
     while True:
         tick(carts)
         if len(carts) == 1:
-            break
-    print("Coordinates of last cart standing:", (carts[0].x, carts[0].y))
+            return carts[0].x, carts[0].y
+
+
+def main() -> None:
+    track = parse()
+
+    print("Coordinates of first crash:", part1(track))
+
+    print("Coordinates of last cart standing:", part2(track))
 
 
 if __name__ == '__main__':
@@ -2,19 +2,62 @@
 # -*- coding: utf-8 -*-
 
 
-recipes = [3, 7]
-cur_index1 = 0
-cur_index2 = 1
-
-obj = [7, 9, 3, 0, 6, 1]
-while obj not in (recipes[-6:], recipes[-7:-1]):
-    recipes.extend(int(x) for x in str(sum((recipes[cur_index1], recipes[cur_index2]))))
-    cur_index1 = (cur_index1 + 1 + recipes[cur_index1]) % len(recipes)
-    cur_index2 = (cur_index2 + 1 + recipes[cur_index2]) % len(recipes)
-    # if len(recipes) in (793071, 793072):
-    #     print("Scores of the ten recipes after the first 793061:", "".join(str(x) for x in recipes[793061:793071]))
-
-if recipes[-6:] == obj:
-    print(len(recipes)-6)
-else:
-    print(len(recipes)-7)
+import os
+import sys
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput
+
+
+def parse(path: Optional[str] = None) -> str:
+    """
+    Puzzle input (my puzzle's one if no input file is given).
+    """
+    if not path:
+        return '793061'
+    with MappedInput(path) as input_:
+        return input_.text().strip()
+
+
+def make_recipes(count: int) -> List[int]:
+    recipes = [3, 7]
+    cur_index1 = 0
+    cur_index2 = 1
+    while len(recipes) < count:
+        recipes.extend(int(x) for x in str(sum((recipes[cur_index1], recipes[cur_index2]))))
+        cur_index1 = (cur_index1 + 1 + recipes[cur_index1]) % len(recipes)
+        cur_index2 = (cur_index2 + 1 + recipes[cur_index2]) % len(recipes)
+    return recipes
+
+
+def part1(puzzle: str) -> str:
+    after = int(puzzle)
+    recipes = make_recipes(after + 10)
+    return "".join(str(x) for x in recipes[after:after+10])
+
+
+def part2(puzzle: str) -> int:
+    recipes = [3, 7]
+    cur_index1 = 0
+    cur_index2 = 1
+
+    obj = [int(x) for x in puzzle]
+    length = len(obj)
+    while obj not in (recipes[-length:], recipes[-length-1:-1]):
+        recipes.extend(int(x) for x in str(sum((recipes[cur_index1], recipes[cur_index2]))))
+        cur_index1 = (cur_index1 + 1 + recipes[cur_index1]) % len(recipes)
+        cur_index2 = (cur_index2 + 1 + recipes[cur_index2]) % len(recipes)
+
+    if recipes[-length:] == obj:
+        return len(recipes)-length
+    else:
+        return len(recipes)-length-1
+
+
+if __name__ == '__main__':
+    puzzle = parse()
+
+    print("Scores of the ten recipes after the first", puzzle + ":", part1(puzzle))
+
+    print(part2(puzzle))
@@ -3,24 +3,27 @@
 
 
 import os
+import sys
 from typing import Sequence, Tuple, List, Optional, Union
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import instrument
+from aoc.inputs import MappedInput, input_path
+
 
 class Game:
 
     def __init__(
             self,
-            input_: str,
+            cave: Sequence[str],
             no_elvish_losses: bool = False,
-            elves_attack_power: int = 3
+            elves_attack_power: int = 3,
+            verbose: bool = False
     ) -> None:
-        self.cave = self._cave_from_input(input_)
+        self.cave = [list(line) for line in cave]
         self.units = self._units_from_cave(elves_attack_power)
         self.no_elvish_losses = no_elvish_losses
-
-    def _cave_from_input(self, input_: str) -> List[List[str]]:
-        with open(input_, encoding='utf-8') as fh:
-            return [list(line) for line in fh.read().split('\n') if line]
+        self.verbose = verbose
 
     def _units_from_cave(self, elves_attack_power: int) -> List['Unit']:
         units = []
@@ -36,12 +39,13 @@ class Game:
         rounds = 0
         while self.round():
             rounds += 1
-            if not self.no_elvish_losses:
+            if self.verbose and not self.no_elvish_losses:
                 self.print_cave()
                 self.print_stats(rounds)
                 input()
-        self.print_cave()
-        self.print_stats(rounds+1)
+        if self.verbose:
+            self.print_cave()
+            self.print_stats(rounds+1)
         return rounds
 
     def round(self) -> bool:
@@ -72,7 +76,8 @@ class Game:
     def result(self) -> int:
         rounds = self.combat()
         hit_points = sum(max(0, unit.hit_points) for unit in self.units)
-        print(rounds, hit_points)
+        if self.verbose:
+            print(rounds, hit_points)
         return rounds * hit_points
 
     def print_cave(self) -> None:
@@ -186,6 +191,24 @@ class Unit:
         paths = [[coord] for coord in self.open_squares_in_range()]
         if not paths:
             return
+        with instrument.timer('day15.move'):
+            step = self._first_step(paths, targets_squares_in_range)
+        instrument.count('day15.move.searches')
+        if not step:
+            return
+        self.cave[self.y][self.x] = '.'
+        self.coords = step
+        self.cave[self.y][self.x] = self.race[0]
+
+    def _first_step(
+            self,
+            paths: List[List[Tuple[int, int]]],
+            targets_squares_in_range: Sequence[Tuple[int, int]]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Breadth-first search of the shortest paths to the squares
+        in range of the targets: first step of the one to take.
+        """
         reached_squares = set(self.open_squares_in_range())
         prev_reached_squares = reached_squares.copy()
         paths_to_targets = []
@@ -194,6 +217,7 @@ class Unit:
                 paths_to_targets.append(path)
         while not paths_to_targets:
             new_paths = []
+            instrument.count('day15.move.expanded', len(paths))
             for i, path in enumerate(paths):
                 continuations = self.open_squares_in_range(path[-1])
                 forks = False
@@ -214,19 +238,12 @@ class Unit:
                 if path[-1] in targets_squares_in_range:
                     paths_to_targets.append(path)
             if prev_reached_squares == reached_squares:
-                return
+                return None
             prev_reached_squares.update(reached_squares)
-        step = None
         for sq in self.open_squares_in_range():
             for path in paths_to_targets:
                 if path[0] == sq:
-                    step = sq
-                    break
-            if step:
-                break
-        self.cave[self.y][self.x] = '.'
-        self.coords = step
-        self.cave[self.y][self.x] = self.race[0]
+                    return sq
 
 
     def turn(self, units: Sequence['Unit']) -> Union[bool, 'Unit']:
@@ -245,31 +262,41 @@ class Unit:
         return True
 
 
-if __name__ == '__main__':
-    game = Game(
-        os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            'input_day15.txt'
-            #'test_input_1.txt'
-        )
-    )
-    elves = sum(1 for unit in game.units if unit.race == 'Elf')
-    print("Outcome of battle:", game.result())
+def parse(path: Optional[str] = None) -> List[str]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return list(input_.lines())
+
+
+def part1(cave: List[str]) -> int:
+    return Game(cave).result()
 
+
+def rescue_elves(cave: List[str]) -> Tuple[int, int]:
+    """
+    Outcome of the first battle without elvish losses,
+    and the elves' attack power needed for it.
+    """
+    elves = sum(line.count('E') for line in cave)
     elves_attack = 4
     elves_perfect = False
     while not elves_perfect:
-        game = Game(
-            os.path.join(
-                os.path.dirname(os.path.abspath(__file__)),
-                'input_day15.txt'
-            ),
-            True,
-            elves_attack
-        )
+        game = Game(cave, True, elves_attack)
         outcome = game.result()
         if elves == len(game.units):
             elves_perfect = True
         else:
             elves_attack += 1
+    return outcome, elves_attack
+
+
+def part2(cave: List[str]) -> int:
+    return rescue_elves(cave)[0]
+
+
+if __name__ == '__main__':
+    cave = parse()
+    #cave = parse(input_path(__file__, 'test_input_1.txt'))
+    print("Outcome of battle:", part1(cave))
+
+    outcome, elves_attack = rescue_elves(cave)
     print("Outcome of battle:", outcome, f"(elves's attack power: {elves_attack})")
@@ -3,8 +3,13 @@
 
 
 import os
+import sys
 import re
-from typing import Optional, Callable, List, Sequence
+from typing import Optional, Callable, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import instrument
+from aoc.inputs import MappedInput, input_path
 
 
 class Register:
@@ -121,8 +126,10 @@ class Device:
         self.put_register(C, 1 if self.register(A) == self.register(B) else 0)
 
     def execute(self, program: 'Program') -> None:
-        for instr in program.instructions:
-            self.converter[instr.opcode](*instr.valuesIO)
+        with instrument.timer('day16.execute'):
+            for instr in program.instructions:
+                self.converter[instr.opcode](*instr.valuesIO)
+        instrument.count('day16.execute.instructions', len(program.instructions))
 
 
 class Sample:
@@ -154,12 +161,9 @@ class Program:
         self.instructions = [ProgramInstruction(instr) for instr in instructions]
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day16.txt'),
-            encoding='utf-8'
-        ) as fh:
-        samples_raw, test_program_raw = fh.read().split('\n\n\n\n')
+def parse(path: Optional[str] = None) -> Tuple[List[Sample], List[List[int]]]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        samples_raw, test_program_raw = input_.text().split('\n\n\n\n')
 
     samples_raw = samples_raw.split('\n\n')
     samples = []
@@ -170,58 +174,82 @@ if __name__ == '__main__':
             args.append([int(val) for val in re.findall(r'\d+', rows[i])])
         samples.append(Sample(*args))
 
-    device = Device()
-    more_than_three_opcodes = 0
+    rows = test_program_raw.splitlines()
+    test_program = [[int(val) for val in re.findall(r'\d+', row)] for row in rows if row]
+    return samples, test_program
+
+
+def compatible_instructions(device: Device, sample: Sample) -> List[Instruction]:
+    compatibles = []
+    for instruction in device.instructions:
+        for i, val in enumerate(sample.before):
+            device.put_register(i, val)
+        instruction(*sample.valuesIO)
+        if sample.after == device.get_all_registers():
+            compatibles.append(instruction)
+    return compatibles
+
+
+def find_opcodes(device: Device, samples: Sequence[Sample]) -> None:
+    """
+    Deduce the opcode of every instruction of device from the samples
+    and fill in device.converter.
+    """
     known_opcodes = set()
 
     for sample in samples:
-        compatibles = []
-        for instruction in device.instructions:
-            for i, val in enumerate(sample.before):
-                device.put_register(i, val)
-            instruction(*sample.valuesIO)
-            if sample.after == device.get_all_registers():
-                compatibles.append((sample, instruction))
-        if len(compatibles) >= 3:
-            more_than_three_opcodes += 1
-        elif len(compatibles) == 1:
-            compatibles[0][1].opcode = compatibles[0][0].opcode
-            known_opcodes.add(compatibles[0][1].opcode)
-            device.converter[compatibles[0][1].opcode] = compatibles[0][1]
-
-    print("Samples that behave like three or more opcodes:", more_than_three_opcodes)
+        compatibles = compatible_instructions(device, sample)
+        if len(compatibles) == 1:
+            compatibles[0].opcode = sample.opcode
+            known_opcodes.add(sample.opcode)
+            device.converter[sample.opcode] = compatibles[0]
 
     while len(known_opcodes) < len(device.instructions):
         for sample in samples:
             if sample.opcode in known_opcodes:
                 continue
             compatible_opcodes = []
-            for instruction in device.instructions:
-                for i, val in enumerate(sample.before):
-                    device.put_register(i, val)
-                instruction(*sample.valuesIO)
-                if sample.after == device.get_all_registers():
-                    if instruction.opcode not in known_opcodes:
-                        compatible_opcodes.append((sample.opcode, instruction))
+            for instruction in compatible_instructions(device, sample):
+                if instruction.opcode not in known_opcodes:
+                    compatible_opcodes.append((sample.opcode, instruction))
             if len(compatible_opcodes) == 1:
                 compatible_opcodes[0][1].opcode = compatible_opcodes[0][0]
                 known_opcodes.add(compatible_opcodes[0][1].opcode)
                 device.converter[compatible_opcodes[0][1].opcode] = compatible_opcodes[0][1]
 
+
+def part1(data: Tuple[List[Sample], List[List[int]]]) -> int:
+    samples, test_program = data
+    device = Device()
+    more_than_three_opcodes = 0
+    for sample in samples:
+        if len(compatible_instructions(device, sample)) >= 3:
+            more_than_three_opcodes += 1
+    return more_than_three_opcodes
+
+
+def part2(data: Tuple[List[Sample], List[List[int]]]) -> int:
+    samples, test_program = data
+    device = Device()
+    find_opcodes(device, samples)
+
     # for instruction in device.instructions:
     #     print(f"Name: {instruction.name} - Opcode: {instruction.opcode}")
 
     # simpler procedural solution
-    # test_program = test_program_raw.splitlines()
     # device.zero_registers()
-    # for row in test_program:
-    #     instr = [int(val) for val in re.findall(r'\d+', row)]
+    # for instr in test_program:
     #     device.converter[instr[0]](*instr[1:])
 
     # object oriented solution
-    rows = test_program_raw.splitlines()
-    test_program = Program([[int(val) for val in re.findall(r'\d+', row)] for row in rows])
     device.zero_registers()
-    device.execute(test_program)
+    device.execute(Program(test_program))
+    return device.register(0)
+
+
+if __name__ == '__main__':
+    data = parse()
+
+    print("Samples that behave like three or more opcodes:", part1(data))
 
-    print(f"Value of register 0 after test program execution is:", device.register(0))
+    print(f"Value of register 0 after test program execution is:", part2(data))
@@ -3,8 +3,12 @@
 
 
 import os
+import sys
 import re
-from typing import Tuple, Sequence, List
+from typing import Dict, Tuple, Sequence, List, Mapping, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class JoinOtherFlowException(Exception):
@@ -13,27 +17,15 @@ class JoinOtherFlowException(Exception):
 
 class Ground:
 
-    def __init__(self, input_: str, water_spring: Tuple[int, int]) -> None:
+    def __init__(
+            self,
+            clay_coords: Sequence[Mapping[str, Tuple[int, int]]],
+            water_spring: Tuple[int, int]
+    ) -> None:
         self.water_spring = water_spring
-        self.vertical_slice = self._scan_ground(input_)
-
-    def _scan_ground(self, input_:str) -> List[List[str]]:
-        with open(input_, encoding='utf-8') as fh:
-            lines = [line for line in fh.read().splitlines() if line]
-        clay_coords = []
-        for line in lines:
-            coords = {}
-            coords_str = line.split(', ')
-            for coord in coords_str:
-                name = coord[0]
-                if '.' in coord:
-                    min_, max_ = [int(i) for i in re.findall(r'\d+', coord)]
-                else:
-                    min_= int(coord[2:])
-                    max_ = min_
-                coords[name] = (min_, max_)
-            clay_coords.append(coords)
+        self.vertical_slice = self._scan_ground(clay_coords)
 
+    def _scan_ground(self, clay_coords: Sequence[Mapping[str, Tuple[int, int]]]) -> List[List[str]]:
         max_x = max(coords['x'][1]+2 for coords in clay_coords)
         # min_x = min(coords['x'][0] for coords in clay_coords)
         self.max_y = max(coords['y'][1]+1 for coords in clay_coords)
@@ -190,14 +182,38 @@ class Water:
                 pass    
 
 
-if __name__ == '__main__':
-    ground = Ground(
-        input_=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day17.txt'),
-        water_spring=(500, 0)
-    )
+def parse(path: Optional[str] = None) -> List[Dict[str, Tuple[int, int]]]:
+    """
+    Ranges of x and y of every vein of clay.
+    """
+    clay_coords = []
+    with MappedInput(path or input_path(__file__)) as input_:
+        for line in input_.lines():
+            coords = {}
+            coords_str = line.split(', ')
+            for coord in coords_str:
+                name = coord[0]
+                if '.' in coord:
+                    min_, max_ = [int(i) for i in re.findall(r'\d+', coord)]
+                else:
+                    min_= int(coord[2:])
+                    max_ = min_
+                coords[name] = (min_, max_)
+            clay_coords.append(coords)
+    return clay_coords
+
+
+def flood(clay_coords: List[Dict[str, Tuple[int, int]]]) -> Ground:
+    ground = Ground(clay_coords, water_spring=(500, 0))
     water = Water(ground)
     water.flow()
+    return ground
 
+
+def count_water(ground: Ground) -> Tuple[int, int]:
+    """
+    Wet squares and squares of stable water in the scanned range.
+    """
     wet_squares = 0
     stable_water = 0
     for y, row in enumerate(ground.vertical_slice):
@@ -205,7 +221,23 @@ if __name__ == '__main__':
             stable_water_in_row = row.count('~')
             stable_water += stable_water_in_row
             wet_squares += row.count('|') + stable_water_in_row
+    return wet_squares, stable_water
+
+
+def part1(clay_coords: List[Dict[str, Tuple[int, int]]]) -> int:
+    return count_water(flood(clay_coords))[0]
+
+
+def part2(clay_coords: List[Dict[str, Tuple[int, int]]]) -> int:
+    return count_water(flood(clay_coords))[1]
+
+
+if __name__ == '__main__':
+    ground = flood(parse())
+
+    for row in ground.vertical_slice:
         print("".join(row[364:589]))
 
+    wet_squares, stable_water = count_water(ground)
     print("Number of wet squares in the vertical slice:", wet_squares)
     print("Number of squares of stable water:", stable_water)
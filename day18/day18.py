@@ -3,20 +3,20 @@
 
 
 import os
+import sys
 from copy import deepcopy
-from typing import List, Tuple, Mapping, Optional
+from typing import List, Tuple, Mapping, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class Ground:
 
-    def __init__(self, input_: str) -> None:
-        self.area = self._scan_ground(input_)
+    def __init__(self, area: Sequence[str]) -> None:
+        self.area = [list(line) for line in area]
         self.snapshots = []
 
-    def _scan_ground(self, input_: str) -> List[List[str]]:
-        with open(input_, encoding='utf-8') as fh:
-            return [list(line) for line in fh.read().split('\n') if line]
-
     def print_area(self, snapshot: Optional[List[List[str]]] = None) -> None:
         area = self.area if not snapshot else snapshot
         for line in area:
@@ -82,17 +82,31 @@ def find_period(ground: Ground) -> Optional[int]:
             # ground.print_area(ground.last_snapshot)
             return len(ground.snapshots) - ground.snapshots.index(old_snapshot) - 1
 
-if __name__ == '__main__':
-    ground = Ground(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day18.txt')
-    )
-    for m in range(1, 1000000001):
+def parse(path: Optional[str] = None) -> List[str]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return list(input_.lines())
+
+
+def part1(area: List[str]) -> int:
+    ground = Ground(area)
+    for m in range(10):
+        ground.next_minute()
+    return ground.compute_value()
+
+
+def part2(area: List[str], minutes: int = 1000000000) -> int:
+    ground = Ground(area)
+    for m in range(1, minutes+1):
         ground.next_minute()
-        if m == 10:
-            print(f"Value after ten minutes: {ground.compute_value()}")
         period = find_period(ground)
         if period:
-            index = (1000000000 - (m - period)) % period
+            index = (minutes - (m - period)) % period
             my_area = ground.snapshots[m - period + index]
-            print(f"Value after one billion minutes: {ground.compute_value(my_area)}")
-            break
+            return ground.compute_value(my_area)
+    return ground.compute_value()
+
+
+if __name__ == '__main__':
+    area = parse()
+    print(f"Value after ten minutes: {part1(area)}")
+    print(f"Value after one billion minutes: {part2(area)}")
@@ -3,8 +3,13 @@
 
 
 import os
+import sys
 import re
-from typing import Optional, Callable, List, Sequence
+from typing import Optional, Callable, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import instrument
+from aoc.inputs import MappedInput, input_path
 
 
 class Register:
@@ -126,9 +131,26 @@ class Device:
     def eqrr(self, A: int, B: int, C: int) -> None:
         self.put_register(C, 1 if self.register(A) == self.register(B) else 0)
 
-    def execute(self, program: 'Program', instruction_pointer: int = 0) -> None:
+    def execute(
+            self,
+            program: 'Program',
+            instruction_pointer: int = 0,
+            until: Optional[int] = None
+    ) -> None:
+        """
+        Run program until it halts or, if until is given, until
+        the instruction pointer reaches that instruction.
+        """
         # print("Nr of instructions:", len(program.instructions))
+        with instrument.timer('day19.execute'):
+            executed = self._run(program, instruction_pointer, until)
+        instrument.count('day19.execute.instructions', executed)
+
+    def _run(self, program: 'Program', instruction_pointer: int, until: Optional[int]) -> int:
+        executed = 0
         while instruction_pointer in range(len(program.instructions)):
+            if instruction_pointer == until:
+                break
             self.put_register(program.register_ip, instruction_pointer)
             exec_instr = program.instructions[instruction_pointer]
             # print("Executing instruction nr. ", instruction_pointer, 
@@ -141,7 +163,9 @@ class Device:
             # self.dump_registers()
             instruction_pointer = self.register(program.register_ip)
             instruction_pointer += 1
+            executed += 1
             # input()
+        return executed
 
     def execute_hack(self) -> None:
         self.put_register(0, 0)
@@ -190,12 +214,13 @@ class Program:
             print(" ".join(str(i) for i in instr.instruction))
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day19.txt'),
-            encoding='utf-8'
-        ) as fh:
-        instructions = [instr for instr in fh.read().splitlines() if instr]
+def parse(path: Optional[str] = None) -> Tuple[int, List[List[int]]]:
+    """
+    Register bound to the instruction pointer and the instructions,
+    with names converted to opcodes.
+    """
+    with MappedInput(path or input_path(__file__)) as input_:
+        instructions = list(input_.lines())
 
     device = Device()
     bound_register = int(re.findall(r'\d', instructions[0])[0])
@@ -204,27 +229,48 @@ if __name__ == '__main__':
         # print(instr)
         opcode_instr = re.sub(r'(^\w{4})', lambda match: str(device.name2instr[match.group(1)].opcode), instr)
         instructions[i] = [int(val) for val in re.findall(r'\d+', opcode_instr)]
+    return bound_register, instructions
+
+
+def part1(data: Tuple[int, List[List[int]]]) -> int:
+    bound_register, instructions = data
+    device = Device()
     daemon = Program(instructions, bound_register)
     device.zero_registers()
     device.execute(daemon)
+    return device.register(0)
+
+
+def part2(data: Tuple[int, List[List[int]]]) -> int:
+    # The background program puts a big number in a register and then
+    # (instructions 1 to 15, in a nested loop) sums in register 0 all the
+    # values which, multiplied in pairs, are equal to it: i.e. its divisors.
+    # So run just the initialization and do the sum here.
+    # (cfr. instruction 13, which puts 1 in register 4, which is added to
+    # the value in register 1 - bound to the instruction pointer - with the
+    # effect of jumping over instruction 15 to instruction 16, which halts
+    # the program, after register 2 becomes greater than register 5).
+    bound_register, instructions = data
+    device = Device()
+    daemon = Program(instructions, bound_register)
+    device.zero_registers()
+    device.put_register(0, 1)
+    device.execute(daemon, until=1)
+    number = max(device.get_all_registers())
+    divisors_sum = 0
+    divisor = 1
+    while divisor * divisor <= number:
+        if not number % divisor:
+            divisors_sum += divisor
+            if divisor * divisor != number:
+                divisors_sum += number // divisor
+        divisor += 1
+    return divisors_sum
+
+
+if __name__ == '__main__':
+    data = parse()
+
+    print(f"Value of register 0 after background program execution is:", part1(data))
 
-    print(f"Value of register 0 after background program execution is:", device.register(0))
-
-    # device.zero_registers()
-    # device.put_register(0, 1)
-    # device.execute_hack()
-    # device.execute(daemon, 3)
-
-    # print("Value of register 0 after second background program execution is:", device.register(0))
-
-    # I didn't write a program to solve the second part of the problem:
-    # daemon program ends execution after register 2 becomes greater than register 5, which has value 10551296
-    # (cfr. instructions 13, which puts 1 in register 4, which is added to the value in register 1 - bound to the instruction pointer -
-    # with the effect of jumping over instrucion 15 to instruction 16, which halts the program)
-    # At the time this happens, register 0 has the sum of all the possible values which, multiplied in pairs,
-    # are equal to the value of register 5 (10551296): the only executed instruction (since the loops begin)
-    # that change value of register 0 is the 7th, which is executed only when instruction 4 outputs 1, which happens when
-    # (instruction 3) the product of the values in registers 2 and 3 is equal to 10551296 (instruction 7 adds the value in
-    # register 2 to the value in register 0, and puts the result in register 0). Since the program proceed in a nested loop
-    # that adds (inner loop) one every iteration to register 3 and adds (outer loop) one every iteration to register 2, before
-    # the execution ends register 2 assumes all the "valid" values from 1 to 10551296 for the register 0 to add.
+    print("Value of register 0 after second background program execution is:", part2(data))
@@ -3,6 +3,21 @@
 
 
 import os
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # only the batch checksum needs it
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
+
+CHUNK_ROWS = 1 << 16
+HASH_BASE = 131
+HASH_MODULUS = (1 << 61) - 1
 
 
 def count_checksum(rows):
@@ -26,37 +41,123 @@ def count_checksum(rows):
     return twos * threes
 
 
-def compare_line(row, other):
-    equals = ''
-    different = 0
-    for i, c in enumerate(row):
-        if row[i] == other[i]:
-            equals += row[i]
-        else:
-            different += 1
-            if different > 1:
-                return False
-    return equals
+def id_chunks(path: str, rows: int = CHUNK_ROWS) -> Iterator[List[bytes]]:
+    """
+    The ids in the file, rows at a time.
+    """
+    with MappedInput(path) as input_:
+        chunk = []
+        for span in input_.spans():
+            chunk.append(input_.buffer[span].tobytes())
+            if len(chunk) == rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def letter_histograms(rows: Sequence[bytes]) -> 'np.ndarray':
+    """
+    Occurrences of every lowercase letter in every row (rows × 26).
+    """
+    width = max(len(row) for row in rows)
+    matrix = np.frombuffer(b''.join(row.ljust(width, b'\0') for row in rows), dtype=np.uint8)
+    bins = matrix.astype(np.intp).reshape(len(rows), width) - ord('a')
+    bins[(bins < 0) | (bins >= 26)] = 26  # one more bin for anything else
+    bins += 27 * np.arange(len(rows))[:, np.newaxis]
+    return np.bincount(bins.ravel(), minlength=27 * len(rows)).reshape(len(rows), 27)[:, :26]
+
+
+def checksum_counts(rows: Sequence[Union[str, bytes]]) -> Tuple[int, int]:
+    rows = [row.encode() if isinstance(row, str) else row for row in rows]
+    histograms = letter_histograms(rows)
+    return int((histograms == 2).any(axis=1).sum()), int((histograms == 3).any(axis=1).sum())
+
+
+def count_checksum_batch(chunks: Iterable[Sequence[Union[str, bytes]]]) -> int:
+    """
+    count_checksum() with NumPy, over chunks of rows: feed it
+    id_chunks() to checksum a file of any size in constant memory.
+    """
+    twos = 0
+    threes = 0
+    for chunk in chunks:
+        if chunk:
+            chunk_twos, chunk_threes = checksum_counts(chunk)
+            twos += chunk_twos
+            threes += chunk_threes
+    return twos * threes
+
+
+def row_hash(row: str) -> int:
+    """
+    Polynomial hash of row, the last character weighing HASH_BASE ** 0.
+    """
+    value = 0
+    for c in row:
+        value = (value * HASH_BASE + ord(c)) % HASH_MODULUS
+    return value
 
 
 def compare_lines(rows):
-    for i, row in enumerate(rows):
-        for other in rows[1:]:
-            if row == other:
+    """
+    Common letters of the two rows differing by exactly one character:
+    for every position, rows (of the same length) colliding once that
+    position is masked out are the pair. Masking a position just takes
+    its term out of the polynomial hash of the row, so the search is
+    O(n·L) instead of the O(n²·L) of comparing every pair of rows; rows
+    whose hashes collide are compared for real.
+    """
+    groups = {}
+    for row in rows:
+        try:
+            groups[len(row)].append(row)
+        except KeyError:
+            groups[len(row)] = [row]
+    hashes = {size: [row_hash(row) for row in group] for size, group in groups.items()}
+    length = max(groups, default=0)
+    powers = [1]
+    for n in range(length):
+        powers.append(powers[-1] * HASH_BASE % HASH_MODULUS)
+    for i in range(length):
+        for size, group in groups.items():
+            if size <= i:
                 continue
-            eq = compare_line(row, other)
-            if eq:
-                return eq
+            weight = powers[size-1-i]
+            keys = [(full - ord(row[i]) * weight) % HASH_MODULUS for row, full in zip(group, hashes[size])]
+            masked = {}
+            clashes = {}  # every row with a key met more than once
+            for row, key in zip(group, keys):
+                first = masked.setdefault(key, row)
+                if first is row:
+                    continue
+                others = clashes.setdefault(key, [first])
+                for other in others:
+                    if other != row and other[:i] == row[:i] and other[i+1:] == row[i+1:]:
+                        return row[:i] + row[i+1:]
+                others.append(row)
+
+
+def parse(path: Optional[str] = None) -> List[str]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return list(input_.lines())
+
+
+def part1(lines: List[str]) -> int:
+    if np is None:
+        return count_checksum(lines)
+    return count_checksum_batch([lines])
+
+
+def part2(lines: List[str]) -> str:
+    return compare_lines(lines)
 
 
-with open(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day2.txt'),
-        encoding='utf-8'
-    ) as fh:
-    lines = [line for line in fh.read().split('\n') if line]
+if __name__ == '__main__':
+    lines = parse()
 
-checksum = count_checksum(lines)
-print("The checksum is", checksum)
+    checksum = part1(lines)
+    print("The checksum is", checksum)
 
-common_letters = compare_lines(lines)
-print("The common letters of the two boxes id are", common_letters)
+    common_letters = part2(lines)
+    print("The common letters of the two boxes id are", common_letters)
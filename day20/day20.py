@@ -3,7 +3,11 @@
 
 
 import os
-from typing import Sequence, Tuple, List
+import sys
+from typing import Sequence, Tuple, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class Building:
@@ -37,7 +41,6 @@ class Building:
             # self.print_map()
             # input()
             pass
-        self.print_map(True)
 
     def print_map(self, finished: bool = False) -> None:
         min_x, min_y = len(self.map[0]), len(self.map)
@@ -123,13 +126,12 @@ class Building:
         return True
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day20.txt'),
-            encoding='utf-8'
-        ) as fh:
-        reg = fh.read().strip('\n')
+def parse(path: Optional[str] = None) -> str:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return input_.text().strip('\n')
+
 
+def explore(reg: str) -> Building:
     # that's probably enough (but not for tests)
     height = (reg.count('N') + reg.count('S')) // 2
     width = (reg.count('W') + reg.count('E')) // 2
@@ -139,6 +141,28 @@ if __name__ == '__main__':
     grid[starting_point[1]][starting_point[0]] = 'X'
     building = Building(grid, starting_point, reg)
     building.walk_paths()
+    return building
+
+
+def part1(reg: str) -> int:
+    building = explore(reg)
+    longest_path = max(building.paths, key=lambda path: len(path))
+    return len(longest_path)
+
+
+def part2(reg: str, least_doors: int = 1000) -> int:
+    building = explore(reg)
+    rooms = set()
+    for path in building.paths:
+        rooms.update(path[least_doors-1:])
+    return len(rooms)
+
+
+if __name__ == '__main__':
+    reg = parse()
+
+    building = explore(reg)
+    building.print_map(True)
     longest_path = max(building.paths, key=lambda path: len(path))
     farthest_room = longest_path[-1]
     alternatives = []
@@ -148,8 +172,5 @@ if __name__ == '__main__':
     print("The shortest path to the farthest room is", len(longest_path))
     print(f"There are {len(alternatives)} alternative routes for that room")
 
-    rooms = set()
     least_doors = 1000
-    for path in building.paths:
-        rooms.update(path[least_doors-1:])
-    print(f"Rooms over {least_doors} doors to pass in order to reach them are", len(rooms))
+    print(f"Rooms over {least_doors} doors to pass in order to reach them are", part2(reg, least_doors))
@@ -3,10 +3,14 @@
 
 
 import os
+import sys
 import re
-from typing import Optional, Callable, List, Sequence
+from typing import Optional, Callable, Iterator, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import instrument
+from aoc.inputs import MappedInput, input_path
 
-# N.B. Solution to second problem is reeaaally slow.
 
 class Register:
 
@@ -168,6 +172,39 @@ class Device:
                         first = False
                         input()
 
+    def watch(self, program: 'Program', breakpoint: int, register: int) -> Iterator[int]:
+        """
+        Run program, yielding the value of register every time
+        the instruction pointer reaches breakpoint.
+        """
+        # only the runs between breaks are timed, not the consumer
+        instruction_pointer = 0
+        while instruction_pointer in range(len(program.instructions)):
+            if instruction_pointer == breakpoint:
+                instrument.count('day21.watch.breaks')
+                yield self.register(register)
+            with instrument.timer('day21.watch'):
+                instruction_pointer, executed = self._run(program, instruction_pointer, breakpoint)
+            instrument.count('day21.watch.instructions', executed)
+
+    def _run(self, program: 'Program', instruction_pointer: int, until: int) -> Tuple[int, int]:
+        """
+        Run program from instruction_pointer until it halts or gets back
+        to until: return where it stopped and the instructions executed.
+        """
+        executed = 0
+        while instruction_pointer in range(len(program.instructions)):
+            if instruction_pointer == until and executed:
+                break
+            self.put_register(program.register_ip, instruction_pointer)
+            exec_instr = program.instructions[instruction_pointer]
+            self.opcode2instr[exec_instr.opcode](*exec_instr.valuesIO)
+            instruction_pointer = self.register(program.register_ip)
+            instruction_pointer += 1
+            executed += 1
+        return instruction_pointer, executed
+
+
 class Sample:
 
     def __init__(
@@ -206,12 +243,13 @@ class Program:
             print(" ".join(str(i) for i in instr.instruction))
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day21.txt'),
-            encoding='utf-8'
-        ) as fh:
-        instructions = [instr for instr in fh.read().splitlines() if instr]
+def parse(path: Optional[str] = None) -> Tuple[int, List[List[int]]]:
+    """
+    Register bound to the instruction pointer and the instructions,
+    with names converted to opcodes.
+    """
+    with MappedInput(path or input_path(__file__)) as input_:
+        instructions = list(input_.lines())
 
     device = Device()
     bound_register = int(re.findall(r'\d', instructions[0])[0])
@@ -220,6 +258,91 @@ if __name__ == '__main__':
         # print(instr)
         opcode_instr = re.sub(r'(^\w{4})', lambda match: str(device.name2instr[match.group(1)].opcode), instr)
         instructions[i] = [int(val) for val in re.findall(r'\d+', opcode_instr)]
+    return bound_register, instructions
+
+
+def halting_check(instructions: Sequence[Sequence[int]]) -> Tuple[int, int]:
+    """
+    The only instruction reading register 0 is the eqrr comparing it
+    with the value which halts the program: return its index and the
+    register holding that value.
+    """
+    eqrr = Device().name2instr['eqrr'].opcode
+    for i, (opcode, A, B, C) in enumerate(instructions):
+        if opcode == eqrr and 0 in (A, B):
+            return i, B if A == 0 else A
+    raise ValueError("No comparison with register 0 in the program.")
+
+
+def halting_values(data: Tuple[int, List[List[int]]]) -> Iterator[int]:
+    bound_register, instructions = data
+    device = Device()
     time_travel_program = Program(instructions, bound_register)
     device.zero_registers()
-    device.execute(time_travel_program, debug=True, breaks=(28,))
+    return device.watch(time_travel_program, *halting_check(instructions))
+
+
+def hash_constants(instructions: Sequence[Sequence[int]]) -> Tuple[int, int, int, int]:
+    """
+    Constants of the hash computed by the program before every halting
+    check: the bit set in the value being hashed, the seed, the mask and
+    the multiplier.
+    """
+    _, register = halting_check(instructions)
+    name2instr = Device().name2instr
+    bori, bani, muli = (name2instr[name].opcode for name in ('bori', 'bani', 'muli'))
+    for start, (opcode, A, B, C) in enumerate(instructions):
+        if opcode == bori and A == register:
+            bit = B
+            seed = instructions[start + 1][1]
+            break
+    else:
+        raise ValueError("No hash of the halting register in the program.")
+    mask = next(B for opcode, A, B, C in instructions[start:] if opcode == bani and A == register)
+    multiplier = next(B for opcode, A, B, C in instructions[start:] if opcode == muli and A == register)
+    return bit, seed, mask, multiplier
+
+
+def hashes(bit: int, seed: int, mask: int, multiplier: int) -> Iterator[int]:
+    """
+    The values compared with register 0, computed natively: the program
+    hashes the previous one (with bit set) a byte at a time, dividing it
+    by 256 with a loop counting up to the quotient.
+    """
+    value = 0
+    while True:
+        rest = value | bit
+        value = seed
+        while True:
+            value = ((value + (rest & 255)) & mask) * multiplier & mask
+            if rest < 256:
+                break
+            rest >>= 8
+        yield value
+
+
+def part1(data: Tuple[int, List[List[int]]]) -> int:
+    return next(halting_values(data))
+
+
+def part2(data: Tuple[int, List[List[int]]]) -> int:
+    # The program halts only once register 0 equals the hash it has just
+    # computed, and every hash depends only on the previous one: so the
+    # answer is the last new value before the sequence starts repeating
+    # itself. Running it on the device takes hours, hence the native hash.
+    bound_register, instructions = data
+    seen = set()
+    last = None
+    for value in hashes(*hash_constants(instructions)):
+        if value in seen:
+            return last
+        seen.add(value)
+        last = value
+
+
+if __name__ == '__main__':
+    data = parse()
+
+    print("Lowest value for register 0 halting the program after the fewest instructions:", part1(data))
+
+    print("Lowest value for register 0 halting the program after the most instructions:", part2(data))
@@ -3,9 +3,14 @@
 
 
 import os
+import sys
 from copy import copy
 from typing import Tuple, Mapping, Optional, Sequence
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc import instrument
+from aoc.inputs import MappedInput
+
 
 
 class Cave:
@@ -103,7 +108,11 @@ class Climber:
             #     print(f"Min distance at minute {self.minutes}: {min_distance} (there are {len(self.paths)} paths). Reached regions: {len(self.reached_regions)}.")
             #     # if not self.minutes % 1000:
             #     #     input()
-            minutes = self.step(min_distance)
+            instrument.count('day22.step.calls')
+            instrument.count('day22.step.paths', len(self.paths))
+            instrument.peak('day22.step.paths_alive', len(self.paths))
+            with instrument.timer('day22.step'):
+                minutes = self.step(min_distance)
         return minutes
 
     def distance_to_target(self, coords: Tuple[int, int]) -> int:
@@ -259,21 +268,42 @@ class Leg:
         return hash((self.coords, self.equipment))
 
     
-if __name__ == '__main__':
-    cave = Cave(depth=9171, target=(7, 721))
+def parse(path: Optional[str] = None) -> Tuple[int, Tuple[int, int]]:
+    """
+    Depth and target of the cave (my puzzle's ones if no input file is given).
+    """
+    if not path:
+        return 9171, (7, 721)
+    with MappedInput(path) as input_:
+        depth, x, y = input_.ints()
+    return depth, (x, y)
+
+
+def part1(data: Tuple[int, Tuple[int, int]]) -> int:
+    depth, target = data
+    cave = Cave(depth=depth, target=target)
     # cave.print_map((60, 721))
-    risk = cave.risk_evaluation()
-    print("Evaluated risk:", risk)
+    return cave.risk_evaluation()
+
 
-    # with open(
-    #         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_input_day22.txt'),
-    #         encoding='utf-8'
-    #     ) as fh:
-    #     lines = [line for line in fh.read().splitlines() if line]
+def part2(data: Tuple[int, Tuple[int, int]]) -> int:
+    depth, target = data
+    cave = Cave(depth=depth, target=target)
+
+    # with MappedInput(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_input_day22.txt')) as input_:
+    #     lines = list(input_.lines())
     # test_cave = TestCave((10, 10), lines)
     # climber = Climber(test_cave)
 
-    print("Finding shortest path...")
     climber = Climber(cave)
-    minutes = climber.find_shortest_path()
-    print("Fewest minutes to reach the target:", minutes)
\ No newline at end of file
+    return climber.find_shortest_path()
+
+
+if __name__ == '__main__':
+    data = parse()
+    risk = part1(data)
+    print("Evaluated risk:", risk)
+
+    print("Finding shortest path...")
+    minutes = part2(data)
+    print("Fewest minutes to reach the target:", minutes)
@@ -2,11 +2,15 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import re
-from typing import Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 from nanobot import Nanobot
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
 
 def to_origin(point, nanobots):
     max_in_range = len(nanobots)
@@ -40,25 +44,26 @@ def to_origin(point, nanobots):
     return prev_pos
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day23.txt'),
-            encoding='utf-8'
-        ) as fh:
-        lines = [line for line in fh.read().splitlines() if line]
-
+def parse(path: Optional[str] = None) -> List[Nanobot]:
     nanobots = []
-    for line in lines:
-        x, y, z, r = re.findall(r'-?\d+', line)
-        nanobots.append(Nanobot((int(x), int(y), int(z)), int(r)))
+    with MappedInput(path or input_path(__file__)) as input_:
+        for line in input_.lines():
+            x, y, z, r = re.findall(r'-?\d+', line)
+            nanobots.append(Nanobot((int(x), int(y), int(z)), int(r)))
+    return nanobots
+
+
+def part1(nanobots: List[Nanobot]) -> int:
     strongest = max(nanobots, key=lambda n: n.signal_radius)
 
     nanobots_in_range = []
     for nanobot in nanobots:
         if strongest.inrange(*nanobot.coords):
             nanobots_in_range.append(nanobot)
-    print(f"Nanobots in range of the signal of the strongest amongst them are {len(nanobots_in_range)}")
+    return len(nanobots_in_range)
 
+
+def intersecting_nanobots(nanobots: List[Nanobot], threshold: int = 974) -> List[Nanobot]:
     intersections = { nanobot: set() for nanobot in nanobots }
     for nanobot, intersecting in intersections.items():
         for other in nanobots:
@@ -67,9 +72,9 @@ if __name__ == '__main__':
     # print("Max intersections:", max(len(inters) for inters in intersections.values()))
     to_remove = []
     for nanobot, intersecting in intersections.items():
-        if len(intersecting) < 974:  # number found "by eye", after printing how many intersecting spheres every sphere has
+        if len(intersecting) < threshold:  # number found "by eye", after printing how many intersecting spheres every sphere has
             to_remove.append(nanobot)
-      
+
     for bot in to_remove:
         del intersections[bot]
         for intersecting in intersections.values():
@@ -77,14 +82,18 @@ if __name__ == '__main__':
                 intersecting.remove(bot)
             except KeyError:
                 pass
-    print(f"{len(intersections)} intersecting nanobots remaining")
 
     # for nanobot, intersecting in intersections.items():
     #     print(f"Nanobot {nanobot} intersects {len(intersecting)} other nanobots")
 
-    nanobots = list(intersections.keys())
-    #from intersecting_nanobots import nanobots
+    return list(intersections.keys())
 
+
+def best_position(nanobots: List[Nanobot]) -> Tuple[int, int, int]:
+    """
+    Point in range of all the given (intersecting) nanobots
+    and nearest to the origin.
+    """
     superintersection = []
     for i, nanobot in enumerate(nanobots):
         a = ((sum(nanobot.coords) - nanobot.signal_radius),
@@ -117,8 +126,23 @@ if __name__ == '__main__':
     #     print("All in range!")
     # else:
     #     print(f"{out_of_range} out of range!")
-   
-    solution = to_origin(point, nanobots)
+
+    return tuple(to_origin(point, nanobots))
+
+
+def part2(nanobots: List[Nanobot]) -> int:
+    return sum(best_position(intersecting_nanobots(nanobots)))
+
+
+if __name__ == '__main__':
+    nanobots = parse()
+
+    print(f"Nanobots in range of the signal of the strongest amongst them are {part1(nanobots)}")
+
+    nanobots = intersecting_nanobots(nanobots)
+    print(f"{len(nanobots)} intersecting nanobots remaining")
+    #from intersecting_nanobots import nanobots
+
+    solution = best_position(nanobots)
 
     print(f"Manhattan distance between ({solution[0]}, {solution[1]}, {solution[2]}) and (0,0,0) is", sum(solution))
-    
\ No newline at end of file
@@ -3,11 +3,15 @@
 
 
 import os
+import sys
 import re
 from enum import Enum
 from copy import deepcopy
 from typing import Sequence, List, Tuple, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
 
 class AttackTypes(Enum):
     SLASHING = 'slashing'
@@ -196,18 +200,24 @@ def build_groups(description: str) -> Sequence[Group]:
     return groups
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day24.txt'),
-            encoding='utf-8'
-        ) as fh:
-        imm_sys, inf = fh.read().split('\n\n')
+def parse(path: Optional[str] = None) -> Tuple[Sequence[Group], Sequence[Group]]:
+    """
+    Groups of the immune system and of the infection.
+    """
+    with MappedInput(path or input_path(__file__)) as input_:
+        imm_sys, inf = input_.text().split('\n\n')
+    return build_groups(imm_sys), build_groups(inf)
 
-    immune_system_groups = build_groups(imm_sys)
-    infection_groups = build_groups(inf)
 
+def fight(
+        immune_system_groups: Sequence[Group],
+        infection_groups: Sequence[Group],
+        boost: int = 0
+) -> Optional[Army]:
     immune_system = Army('immune_system', deepcopy(immune_system_groups))
     infection = Army('infection', deepcopy(infection_groups))
+    for group in immune_system.groups:
+        group.attack.damage += boost
 
     # print('Immune system:\n')
     # for group in immune_system.groups:
@@ -217,22 +227,21 @@ if __name__ == '__main__':
     #     group.info_dump()
 
     combat = Combat(immune_system, infection)
-    winner = combat.combat()
+    return combat.combat()
 
-    print(f'The winner is {winner.name}, with {sum(group.units for group in winner.groups)} units standing.')
-    # for group in winner.groups:
-    #     group.info_dump()
 
+def minimum_boost(
+        immune_system_groups: Sequence[Group],
+        infection_groups: Sequence[Group]
+) -> Tuple[int, Army]:
+    """
+    Smallest boost letting the immune system win, and the winning army.
+    """
     boost = 1000
     upper_limit, lower_limit = 0, 0
     while not upper_limit - lower_limit == 1:
         prev_boost = boost
-        immune_system = Army('immune_system', deepcopy(immune_system_groups))
-        infection = Army('infection', deepcopy(infection_groups))
-        for group in immune_system.groups:
-            group.attack.damage += boost
-        combat = Combat(immune_system, infection)
-        winner = combat.combat()
+        winner = fight(immune_system_groups, infection_groups, boost)
         if not winner or winner.name == 'infection':
             lower_limit = boost
             if upper_limit:
@@ -244,6 +253,29 @@ if __name__ == '__main__':
             upper_limit = boost
             limits_sum = upper_limit + lower_limit
             boost = limits_sum // 2 + limits_sum % 2
+    return prev_boost, winner
+
+
+def part1(groups: Tuple[Sequence[Group], Sequence[Group]]) -> int:
+    winner = fight(*groups)
+    return sum(group.units for group in winner.groups)
+
+
+def part2(groups: Tuple[Sequence[Group], Sequence[Group]]) -> int:
+    boost, winner = minimum_boost(*groups)
+    return sum(group.units for group in winner.groups)
+
+
+if __name__ == '__main__':
+    immune_system_groups, infection_groups = parse()
+
+    winner = fight(immune_system_groups, infection_groups)
+
+    print(f'The winner is {winner.name}, with {sum(group.units for group in winner.groups)} units standing.')
+    # for group in winner.groups:
+    #     group.info_dump()
+
+    prev_boost, winner = minimum_boost(immune_system_groups, infection_groups)
 
     print("Minimum boost to give to immune system in order for him to win is", prev_boost)
     print(f'With boost of {prev_boost} {winner.name} wins with {sum(group.units for group in winner.groups)} units standing.')
@@ -3,8 +3,12 @@
 
 
 import os
+import sys
 import re
-from typing import Tuple
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
 
 class Point:
@@ -18,17 +22,17 @@ class Point:
                 + abs(self.z - other.z) + abs(self.t - other.t) <= 3)
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day25.txt'),
-            encoding='utf-8'
-        ) as fh:
-        lines = [line for line in fh.read().splitlines() if line]
-
+def parse(path: Optional[str] = None) -> List[Tuple[int, int, int, int]]:
     points = []
-    for line in lines:
-        x, y, z, t = re.findall(r'-?\d+', line)
-        points.append(Point((int(x), int(y), int(z), int(t))))
+    with MappedInput(path or input_path(__file__)) as input_:
+        for line in input_.lines():
+            x, y, z, t = re.findall(r'-?\d+', line)
+            points.append((int(x), int(y), int(z), int(t)))
+    return points
+
+
+def part1(coords: List[Tuple[int, int, int, int]]) -> int:
+    points = [Point(point) for point in coords]
 
     constellations = []
     for i, point in enumerate(points):
@@ -50,5 +54,15 @@ if __name__ == '__main__':
             constellations.append(new_const)
             for p in new_const:
                 p.constellation = new_const
+    return len(constellations)
+
+
+def part2(coords: List[Tuple[int, int, int, int]]) -> None:
+    # the last day has only one puzzle
+    return None
+
+
+if __name__ == '__main__':
+    coords = parse()
 
-    print(f"There are {len(constellations)} constellations of fixed spacetime points.")
+    print(f"There are {part1(coords)} constellations of fixed spacetime points.")
@@ -4,6 +4,19 @@
 
 import re
 import os
+import sys
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # then every fabric is swept
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
+
+DENSE_LIMIT = 10 ** 7  # inches of fabric (12 bytes each) beyond which claims are swept
 
 
 class Square(object):
@@ -20,46 +33,226 @@ class Square(object):
                        for y in range(self.y, self.y+self.height)]
 
 
-with open(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day3.txt'),
-        encoding='utf-8'
-    ) as fh:
-    lines = [line for line in fh.read().split('\n') if line]
-
-squares = []
-for line in lines:
-    match = re.search(r'#(\d+) @ (\d+),(\d+): (\d+)x(\d+)', line)
-    id_, x, y, w, h = (match.group(1),
-                       match.group(2),
-                       match.group(3),
-                       match.group(4),
-                       match.group(5)
-                      )
-    sq = Square(int(id_), int(x), int(y), int(w), int(h))
-    squares.append(sq)
-
-fabric = [ [0] * 1000 for x in range(1000) ]
-
-for sq in squares:
-    for x, y in sq.inches():
-        if not fabric[x][y]:
-            fabric[x][y] = sq.id
+def parse(path: Optional[str] = None) -> List[Square]:
+    squares = []
+    with MappedInput(path or input_path(__file__)) as input_:
+        for line in input_.lines():
+            match = re.search(r'#(\d+) @ (\d+),(\d+): (\d+)x(\d+)', line)
+            id_, x, y, w, h = (match.group(1),
+                               match.group(2),
+                               match.group(3),
+                               match.group(4),
+                               match.group(5)
+                              )
+            sq = Square(int(id_), int(x), int(y), int(w), int(h))
+            squares.append(sq)
+    return squares
+
+
+class Fenwick:
+    """
+    Counts of the positions 0..size-1, with O(log n) updates and prefix sums.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.tree = [0] * (size + 1)
+
+    def add(self, position: int, value: int) -> None:
+        position += 1
+        while position < len(self.tree):
+            self.tree[position] += value
+            position += position & -position
+
+    def prefix(self, stop: int) -> int:
+        """
+        Sum of the counts of the positions before stop.
+        """
+        total = 0
+        while stop > 0:
+            total += self.tree[stop]
+            stop -= stop & -stop
+        return total
+
+
+class Intervals:
+    """
+    Half-open intervals [lo, hi) over compressed coordinates, and how
+    many of them intersect a given one: all of them but the ones
+    starting at or after its end and the ones ending at or before its start.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.total = 0
+        self.starts = Fenwick(size)
+        self.ends = Fenwick(size)
+
+    def add(self, lo: int, hi: int, value: int = 1) -> None:
+        self.total += value
+        self.starts.add(lo, value)
+        self.ends.add(hi, value)
+
+    def intersecting(self, lo: int, hi: int) -> int:
+        starting_after = self.total - self.starts.prefix(hi)
+        return self.total - starting_after - self.ends.prefix(lo + 1)
+
+
+class Coverage:
+    """
+    Segment tree over the elementary segments between sorted coordinates,
+    tracking the length covered by at least one and at least two intervals.
+    """
+
+    def __init__(self, coords: List[int]) -> None:
+        self.coords = coords
+        size = 4 * max(len(coords) - 1, 1)
+        self.count = [0] * size
+        self.once = [0] * size
+        self.twice = [0] * size
+
+    def add(self, lo: int, hi: int, value: int) -> None:
+        self._add(1, 0, len(self.coords) - 1, lo, hi, value)
+
+    @property
+    def overlapped(self) -> int:
+        return self.twice[1]
+
+    def _add(self, node: int, left: int, right: int, lo: int, hi: int, value: int) -> None:
+        if hi <= left or right <= lo:
+            return
+        if lo <= left and right <= hi:
+            self.count[node] += value
+        else:
+            middle = (left + right) // 2
+            self._add(2 * node, left, middle, lo, hi, value)
+            self._add(2 * node + 1, middle, right, lo, hi, value)
+        length = self.coords[right] - self.coords[left]
+        leaf = right - left == 1
+        if self.count[node] >= 2:
+            self.once[node] = self.twice[node] = length
+        elif self.count[node] == 1:
+            self.once[node] = length
+            self.twice[node] = 0 if leaf else self.once[2 * node] + self.once[2 * node + 1]
+        elif leaf:
+            self.once[node] = self.twice[node] = 0
         else:
-            fabric[x][y] = 'X'
-
-ids = {}
-for row in fabric:
-    for num in row:
-        try:
-            ids[num] += 1
-        except KeyError:
-            ids[num] = 1
-
-print("Overlapping inches:", ids['X'])
-
-for sq in squares:
-    try:
-        if ids[sq.id] == len(sq.inches()):
-            print("Non overlapping square's id:", sq.id)
-    except KeyError:
-        pass
+            self.once[node] = self.once[2 * node] + self.once[2 * node + 1]
+            self.twice[node] = self.twice[2 * node] + self.twice[2 * node + 1]
+
+
+def sweep(squares: List[Square]) -> Tuple[int, List[int]]:
+    """
+    Overlapped inches and ids of the intact claims, sweeping a line
+    over the x edges of the claims: O(n log n), whatever the size of
+    the fabric. A claim overlaps another one if, when the line reaches
+    it, it intersects a claim already under the line, or if it intersects
+    one of those the line reaches while passing over it.
+    """
+    squares = [sq for sq in squares if sq.width and sq.height]
+    ys = sorted({sq.y for sq in squares} | {sq.y + sq.height for sq in squares})
+    index = {y: i for i, y in enumerate(ys)}
+    spans = {sq.id: (index[sq.y], index[sq.y + sq.height]) for sq in squares}
+    events = sorted(
+        [(sq.x, 1, sq) for sq in squares] + [(sq.x + sq.width, 0, sq) for sq in squares],
+        key=lambda event: event[:2]
+    )  # claims leave the line before the ones at the same x come in
+
+    coverage = Coverage(ys)
+    active = Intervals(len(ys))
+    reached = Intervals(len(ys))
+    met_on_arrival = {}
+    overlapping = set()
+    area = 0
+    previous_x = events[0][0] if events else 0
+    for x, arrival, sq in events:
+        area += coverage.overlapped * (x - previous_x)
+        previous_x = x
+        lo, hi = spans[sq.id]
+        if arrival:
+            if active.intersecting(lo, hi):
+                overlapping.add(sq.id)
+            met_on_arrival[sq.id] = reached.intersecting(lo, hi)
+            active.add(lo, hi)
+            reached.add(lo, hi)
+            coverage.add(lo, hi, 1)
+        else:
+            if reached.intersecting(lo, hi) - met_on_arrival[sq.id] > 1:  # itself
+                overlapping.add(sq.id)
+            active.add(lo, hi, -1)
+            coverage.add(lo, hi, -1)
+    return area, [sq.id for sq in squares if sq.id not in overlapping]
+
+
+def claims_array(squares: List[Square]) -> 'np.ndarray':
+    return np.array([(sq.x, sq.y, sq.width, sq.height) for sq in squares], dtype=np.int64).reshape(-1, 4)
+
+
+def coverage(claims: 'np.ndarray') -> 'np.ndarray':
+    """
+    Number of claims over every inch of fabric. Every claim only adds
+    its four corners to a difference array, then two cumulative sums
+    spread them over the fabric, in place: 4 bytes per inch.
+    """
+    x, y, w, h = claims.T
+    width = int((x + w).max(initial=0)) + 1
+    height = int((y + h).max(initial=0)) + 1
+    corners = np.concatenate(((x * height + y),
+                              ((x + w) * height + y),
+                              (x * height + y + h),
+                              ((x + w) * height + y + h)))
+    signs = np.repeat(np.array([1, -1, -1, 1], dtype=np.int32), len(claims))
+    fabric = np.zeros((width, height), dtype=np.int32)
+    np.add.at(fabric.reshape(-1), corners, signs)
+    fabric.cumsum(0, out=fabric)
+    fabric.cumsum(1, out=fabric)
+    return fabric
+
+
+def intact_claims(claims: 'np.ndarray', fabric: 'np.ndarray') -> 'np.ndarray':
+    """
+    Mask of the claims overlapping no other one: the ones whose
+    inches sum up to their area, looked up in a summed-area table
+    (8 bytes per inch, built in place).
+    """
+    table = np.zeros((fabric.shape[0] + 1, fabric.shape[1] + 1), dtype=np.int64)
+    table[1:, 1:] = fabric
+    table.cumsum(0, out=table)
+    table.cumsum(1, out=table)
+    x, y, w, h = claims.T
+    covered = table[x + w, y + h] - table[x, y + h] - table[x + w, y] + table[x, y]
+    return covered == w * h
+
+
+def dense(squares: List[Square]) -> bool:
+    """
+    Whether the fabric is small enough to be allocated.
+    """
+    if np is None:
+        return False
+    width = max((sq.x + sq.width for sq in squares), default=0)
+    height = max((sq.y + sq.height for sq in squares), default=0)
+    return (width + 1) * (height + 1) <= DENSE_LIMIT
+
+
+def part1(squares: List[Square]) -> int:
+    if not dense(squares):
+        return sweep(squares)[0]
+    return int((coverage(claims_array(squares)) > 1).sum())
+
+
+def part2(squares: List[Square]) -> Optional[int]:
+    if not dense(squares):
+        intact = sweep(squares)[1]
+        return intact[0] if intact else None
+    claims = claims_array(squares)
+    for sq, intact in zip(squares, intact_claims(claims, coverage(claims))):
+        if intact and sq.width and sq.height:
+            return sq.id
+    return None
+
+
+if __name__ == '__main__':
+    squares = parse()
+
+    print("Overlapping inches:", part1(squares))
+
+    print("Non overlapping square's id:", part2(squares))
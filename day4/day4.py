@@ -2,76 +2,191 @@
 # -*- coding: utf-8 -*-
 
 
+import heapq
 import os
-from datetime import datetime
-import re
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
+
+MINUTES = 60
+REORDER_WINDOW = 1024
 
 
 class Guard:
     def __init__(self, id_):
         self.id = id_
-        self.minutes_sleeping = []
+        self.minutes_asleep = array('I', [0]) * MINUTES
+        self.asleep = 0
+        self.favorite = (0, 0)  # minute most asleep and times
+
+    def sleep(self, start: int, end: int) -> None:
+        minutes_asleep = self.minutes_asleep
+        minute, times = self.favorite
+        for n in range(start, end):
+            minutes_asleep[n] += 1
+            if minutes_asleep[n] > times or (minutes_asleep[n] == times and n < minute):
+                minute, times = n, minutes_asleep[n]
+        self.favorite = (minute, times)
+        self.asleep += end - start
 
 
 def find_favorite_minute(guard):
-    mins_dict = {}
-    for minute in guard.minutes_sleeping:
-        try:
-            mins_dict[minute] += 1
-        except KeyError:
-            mins_dict[minute] = 1
-
-    favorite_minute = None
-    max_times = 0
-    for minute, times in mins_dict.items():
+    max_times = max(guard.minutes_asleep)
+    return guard.minutes_asleep.index(max_times), max_times
+
+
+class ShiftLog:
+    """
+    Incremental reading of an append-only log whose lines can come out
+    of order by less than window lines: they wait in a heap and are
+    recorded in chronological order once window newer lines arrived
+    (or on flush()). The guards most asleep overall and on the same
+    minute are kept up to date as the lines are recorded, so the
+    answers are available at any moment.
+    """
+
+    def __init__(self, window: int = REORDER_WINDOW) -> None:
+        self.window = window
+        self.guards: Dict[str, Guard] = {}
+        self.sleepy: Optional[Guard] = None
+        self.regular: Optional[Guard] = None
+        self.offset = 0
+        self._pending: List[bytes] = []
+        self._last = b''
+        self._guard = None
+        self._start = None
+
+    def feed(self, lines: Iterable[bytes]) -> None:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if line < self._last:
+                raise ValueError(f"{line!r} is more than {self.window} lines late.")
+            heapq.heappush(self._pending, line)
+            if len(self._pending) > self.window:
+                self.record(heapq.heappop(self._pending))
+
+    def flush(self) -> None:
+        while self._pending:
+            self.record(heapq.heappop(self._pending))
+
+    def follow(self, path: str) -> None:
+        """
+        Feed the complete lines appended to the file since the last call.
+        """
+        with MappedInput(path) as input_:
+            end = input_.buffer.obj.rfind(b'\n', self.offset) + 1
+            if end > self.offset:
+                self.feed(input_.buffer[self.offset:end].tobytes().splitlines())
+                self.offset = end
+
+    def record(self, line: bytes) -> None:
+        """
+        Record a line in chronological order. Lines look like
+        b'[1518-11-01 00:05] falls asleep': minute and action
+        are at fixed offsets.
+        """
+        self._last = line
+        action = line[19:20]
+        if action == b'G':  # Guard #id begins shift
+            id_ = line[26:line.index(b' ', 26)].decode()
+            try:
+                self._guard = self.guards[id_]
+            except KeyError:
+                self._guard = self.guards[id_] = Guard(int(id_))
+            self._start = None
+        elif action == b'f':
+            if self._guard is None:
+                raise ValueError(f"{line!r}: nobody is on shift.")
+            self._start = int(line[15:17])
+        elif action == b'w':
+            if self._start is None:
+                raise ValueError(f"{line!r}: nobody is asleep.")
+            guard = self._guard
+            guard.sleep(self._start, int(line[15:17]))
+            self._start = None
+            if self.sleepy is None or self.sleepy.asleep < guard.asleep:
+                self.sleepy = guard
+            if self.regular is None or self.regular.favorite[1] < guard.favorite[1]:
+                self.regular = guard
+
+    def part1(self) -> Optional[int]:
+        return self.sleepy.id * self.sleepy.favorite[0] if self.sleepy else None
+
+    def part2(self) -> Optional[int]:
+        return self.regular.id * self.regular.favorite[0] if self.regular else None
+
+
+def parse(path: Optional[str] = None) -> Dict[str, Guard]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        lines = [input_.buffer[span].tobytes() for span in input_.spans()]
+    lines.sort()  # ISO timestamps first: lexical order is chronological
+    log = ShiftLog(window=0)
+    log.feed(lines)
+    return log.guards
+
+
+def survey(guards: Dict[str, Guard]) -> Tuple[Tuple[Guard, int], Tuple[Guard, int, int]]:
+    """
+    One pass over the guards × minutes matrix: the guard most asleep
+    with his favorite minute, and the guard who spent the same minute
+    most asleep, with that minute and the times he was asleep on it.
+    """
+    sleepy = regular = None
+    max_asleep = max_times = -1
+    for guard in guards.values():
+        row = guard.minutes_asleep
+        asleep = sum(row)
+        times = max(row)
+        if max_asleep < asleep:
+            max_asleep = asleep
+            sleepy = (guard, row.index(times))
         if max_times < times:
             max_times = times
-            favorite_minute = minute
-    return favorite_minute, max_times
-
-
-with open(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day4.txt'),
-        encoding='utf-8'
-    ) as fh:
-    lines = [line for line in fh.read().split('\n') if line]
-
-lines.sort(key=lambda line: datetime.strptime(line[1:17], '%Y-%m-%d %H:%M'))
-
-guards = {}
-
-for line in lines:
-    if 'begins shift' in line:
-        id_ = re.search(r'#(\d+)', line).group(1)
-        try:
-            guards[id_]
-        except KeyError:
-            guards[id_] = Guard(int(id_))
-    elif 'falls asleep' in line:
-        start = int(re.search(r'\d+:(\d+)', line).group(1))
-    elif 'wakes up' in line:
-        end = int(re.search(r'\d+:(\d+)', line).group(1))
-        guards[id_].minutes_sleeping.extend(range(start, end))
-
-max_min_asleep = 0
-for id_, guard in guards.items():
-    if max_min_asleep < len(guard.minutes_sleeping):
-        max_min_asleep = len(guard.minutes_sleeping)
-        sleepy_guard = guard
-
-print("The sleepy guard is", sleepy_guard.id)
-
-favmin, times_asleep = find_favorite_minute(sleepy_guard)
-
-print("His favorite minute for snap is", favmin)
-print("So, the product of the two numbers is", sleepy_guard.id * favmin)
-
-max_mins_dict = tuple()
-for id_, guard in guards.items():
-    favmin, times_asleep = find_favorite_minute(guard)
-    if not max_mins_dict or max_mins_dict[2] < times_asleep:
-        max_mins_dict = (guard, favmin, times_asleep)
-
-print("The guard who spent the same minute most asleep is id", max_mins_dict[0].id)
-print("The minute most spent asleep is", max_mins_dict[1], f"({max_mins_dict[2]} times)") 
-print("And their product is", max_mins_dict[0].id * max_mins_dict[1])
+            regular = (guard, row.index(times), times)
+    return sleepy, regular
+
+
+def find_sleepy_guard(guards: Dict[str, Guard]) -> Guard:
+    return survey(guards)[0][0]
+
+
+def find_regular_guard(guards: Dict[str, Guard]) -> Tuple[Guard, int, int]:
+    """
+    The guard who spent the same minute most asleep,
+    with that minute and the times he was asleep on it.
+    """
+    return survey(guards)[1]
+
+
+def part1(guards: Dict[str, Guard]) -> int:
+    sleepy_guard, favmin = survey(guards)[0]
+    return sleepy_guard.id * favmin
+
+
+def part2(guards: Dict[str, Guard]) -> int:
+    guard, favmin, times_asleep = survey(guards)[1]
+    return guard.id * favmin
+
+
+if __name__ == '__main__':
+    guards = parse()
+
+    sleepy_guard = find_sleepy_guard(guards)
+    print("The sleepy guard is", sleepy_guard.id)
+
+    favmin, times_asleep = find_favorite_minute(sleepy_guard)
+
+    print("His favorite minute for snap is", favmin)
+    print("So, the product of the two numbers is", part1(guards))
+
+    max_mins_dict = find_regular_guard(guards)
+
+    print("The guard who spent the same minute most asleep is id", max_mins_dict[0].id)
+    print("The minute most spent asleep is", max_mins_dict[1], f"({max_mins_dict[2]} times)")
+    print("And their product is", part2(guards))
@@ -3,38 +3,129 @@
 
 
 import os
+import sys
+from typing import Iterable, Optional, Tuple, Union
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+from aoc.parallel import cpu_count, pool_map
 
-def reacting_polymer(poly):
-    n = 0
-    while n < len(poly) - 2:
-        if (poly[n] == poly[n+1] - 0x20 or poly[n] == poly[n+1] + 0x20):
-            poly = poly[:n]+poly[n+2:]
-            n = max(n-1, 0)
+
+CHUNK_SIZE = 1 << 22  # units reduced by every worker
+
+
+def reacting_polymer(poly: bytes) -> bytes:
+    """
+    What is left of poly after all the reactions, in one pass: every
+    unit either reacts with the last unit left so far or is left too.
+    """
+    left = bytearray()
+    for unit in poly:
+        if left and left[-1] ^ unit == 0x20:  # same type, opposite polarity
+            left.pop()
         else:
+            left.append(unit)
+    return bytes(left)
+
+
+def merge_reduced(fragments: Iterable[bytes]) -> bytes:
+    """
+    Reduction of the concatenation of reduced fragments: inside them
+    nothing reacts anymore, so only the units meeting at the seams can.
+    """
+    left = bytearray()
+    for fragment in fragments:
+        n = 0
+        while left and n < len(fragment) and left[-1] ^ fragment[n] == 0x20:
+            left.pop()
             n += 1
-    return poly
+        left += fragment[n:]
+    return bytes(left)
 
 
-if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day5.txt'),
-            'rb'
-        ) as fh:
-        polymer = fh.read()
+def reacting_span(span: Tuple[str, int, int]) -> bytes:
+    path, start, stop = span
+    with MappedInput(path) as input_:
+        return reacting_polymer(input_.buffer[start:stop].tobytes())
+
+
+def parallel_reacting_polymer(poly: bytes, chunk_size: int = CHUNK_SIZE) -> bytes:
+    """
+    reacting_polymer() with the polymer split in chunks reduced by
+    one process each, then merged.
+    """
+    if len(poly) <= chunk_size or cpu_count() == 1:
+        return reacting_polymer(poly)
+    chunks = (poly[n:n+chunk_size] for n in range(0, len(poly), chunk_size))
+    return merge_reduced(pool_map(reacting_polymer, chunks))
+
+
+def reacting_file(path: str, chunk_size: int = CHUNK_SIZE) -> bytes:
+    """
+    parallel_reacting_polymer() of a polymer too big to be read at once:
+    every worker maps the file and reduces its own span of it.
+    """
+    with MappedInput(path) as input_:
+        size = len(input_.buffer)
+        while size and input_.buffer[size-1] in b' \t\r\n':
+            size -= 1
+    spans = ((path, n, min(n + chunk_size, size)) for n in range(0, size, chunk_size))
+    return merge_reduced(pool_map(reacting_span, spans))
+
+
+def improved_length(reduced: Iterable[int], unit: int) -> int:
+    """
+    Length of the polymer without the units of the given type (uppercase).
+    Reactions don't depend on the order they happen in, so it can start
+    from the polymer already reduced instead of the original one. The
+    units of the type are skipped while reacting, so reduced (e.g. a
+    view of shared memory) isn't copied.
+    """
+    removed = unit | 0x20
+    left = bytearray()
+    for other in reduced:
+        if other | 0x20 == removed:
+            continue
+        if left and left[-1] ^ other == 0x20:  # same type, opposite polarity
+            left.pop()
+        else:
+            left.append(other)
+    return len(left)
+
+
+def parse(path: Optional[str] = None) -> Union[bytes, str]:
+    """
+    The polymer or, if it's bigger than a chunk, the path of its file:
+    then the workers reduce it straight from the file (see reacting_file)
+    instead of getting it in pickled chunks.
+    """
+    path = path or input_path(__file__)
+    if os.path.getsize(path) > CHUNK_SIZE:
+        return path
+    with MappedInput(path) as input_:
+        return bytes(input_.buffer).strip()
+
+
+def reduced_polymer(polymer: Union[bytes, str]) -> bytes:
+    if isinstance(polymer, str):
+        return reacting_file(polymer)
+    return parallel_reacting_polymer(polymer)
 
-    reduced_polymer = reacting_polymer(polymer)
 
-    print("Polymer's length:", len(reduced_polymer))
+def part1(polymer: Union[bytes, str]) -> int:
+    return len(reduced_polymer(polymer))
 
+
+def part2(polymer: Union[bytes, str]) -> int:
     ascii_uppercase = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
-    min_length = len(polymer)
-    for c in ascii_uppercase:
-        improved_polymer = polymer.replace(bytes((c,)), b'')
-        improved_polymer = improved_polymer.replace(bytes((c+0x20,)), b'')
-        reduced_impr_poly = reacting_polymer(improved_polymer)
-        if min_length > len(reduced_impr_poly):
-            min_length = len(reduced_impr_poly)
+    reduced = reduced_polymer(polymer)
+    return min(improved_length(reduced, c) for c in ascii_uppercase)
+
+
+if __name__ == '__main__':
+    polymer = parse()
+
+    print("Polymer's length:", part1(polymer))
 
-    print("Shortest length:", min_length)
+    print("Shortest length:", part2(polymer))
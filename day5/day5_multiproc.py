@@ -3,44 +3,49 @@
 
 
 import os
-from multiprocessing import Pool
-
-
-def reacting_polymer(poly):
-    n = 0
-    while n < len(poly) - 2:
-        if (poly[n] == poly[n+1] - 0x20 or poly[n] == poly[n+1] + 0x20):
-            poly = poly[:n]+poly[n+2:]
-            n = max(n-1, 0)
-        else:
-            n += 1
-    return poly
-
-
-def improving_polymer(data):
-    improved = data[1].replace(bytes((data[0],)), b'')
-    improved = improved.replace(bytes((data[0]+0x20,)), b'')
-    reduced_impr_poly = reacting_polymer(improved)
-    return len(reduced_impr_poly)
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+from aoc.parallel import pool_map
+from day5 import improved_length, reacting_polymer
+
+
+def improving_polymer(data: Tuple[str, int, int]) -> int:
+    """
+    Length of the improved polymer for one unit type: the reduced polymer
+    is read in place from the shared memory block, only its name crosses
+    processes, so every worker allocates just the polymer it's left with.
+    """
+    name, size, unit = data
+    block = SharedMemory(name=name)
+    reduced = block.buf[:size]
+    try:
+        return improved_length(reduced, unit)
+    finally:
+        reduced.release()
+        block.close()
 
 
 if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day5.txt'),
-            'rb'
-        ) as fh:
-        polymer = fh.read()
+    with MappedInput(input_path(__file__)) as input_:
+        polymer = bytes(input_.buffer).strip()
 
     reduced_polymer = reacting_polymer(polymer)
 
     print("Polymer's length:", len(reduced_polymer))
 
     ascii_uppercase = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    args_for_child_procs = ((c, formula) for c in ascii_uppercase for formula in (polymer,))
-
-    with Pool(len(os.sched_getaffinity(0))) as p:
-        result = p.map_async(improving_polymer, args_for_child_procs)
-        res_value = result.get()
-        min_length = min(res_value)
+    shared = SharedMemory(create=True, size=max(len(reduced_polymer), 1))
+    try:
+        shared.buf[:len(reduced_polymer)] = reduced_polymer
+        args_for_child_procs = ((shared.name, len(reduced_polymer), c) for c in ascii_uppercase)
+        res_value = pool_map(improving_polymer, args_for_child_procs)
+    finally:
+        shared.close()
+        shared.unlink()
+    min_length = min(res_value)
 
     print("Shortest length:", min_length)
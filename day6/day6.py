@@ -3,18 +3,29 @@
 
 
 import os
+import sys
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # then the field is scanned point by point
+    np = None
 
-def draw_point(field, coords):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+
+
+SAFE_DISTANCE = 10000
+TILE_CELLS = 1 << 20  # cells of the field computed at once
+
+
+def draw_point(field, coords, px, py):
     distance_sum = 0
     min_distance = 1000
     more_min_distances = False
     other_min_distance = 1000
     for i, (x, y) in enumerate(coords):
         codepoint = chr(0x41 + i)
-        if (px, py) == (x, y):
-            nearest = codepoint
-            min_distance = 0
         distance = abs(px - x) + abs(py - y)
         distance_sum += distance
         if distance < min_distance:
@@ -29,44 +40,150 @@ def draw_point(field, coords):
     return nearest, distance_sum
 
 
-def get_package_root():
-    from . import __file__ as initpy_file_path
-    return os.path.dirname(initpy_file_path)
+def parse(path: Optional[str] = None) -> List[Tuple[int, int]]:
+    with MappedInput(path or input_path(__file__)) as input_:
+        lines = [line.split(', ') for line in input_.lines()]
+    return [(int(x), int(y)) for (x, y) in lines]
+
+
+def scan_field(coords: List[Tuple[int, int]]) -> Tuple[Dict[str, int], List[str], int]:
+    """
+    Area of every coordinate, labels of the ones touching the border
+    (i.e. with infinite areas) and number of locations in the field
+    within SAFE_DISTANCE from all the coordinates.
+    """
+    field = [ ['x'] * max((x for (x, y) in coords)) for n in range(max((y for (x, y) in coords)))]
+
+    areas = { chr(i): 0 for i in range(0x41, 0x41+len(coords)) }
+
+    to_exclude = []
+    near_to_all = 0
+    for px, row in enumerate(field):
+        for py, col in enumerate(row):
+            try:
+                nearest_coord, sum_of_distances = draw_point(field, coords, px, py)
+                if sum_of_distances < SAFE_DISTANCE:
+                    near_to_all += 1
+                areas[nearest_coord] += 1
+            except KeyError:
+                pass
+            if px in (0, len(field)-1) or py in (0, len(row)-1):
+                to_exclude.append(nearest_coord)
+    return areas, to_exclude, near_to_all
+
+
+def field_tiles(
+        coords: List[Tuple[int, int]],
+        tile_cells: int = TILE_CELLS
+) -> Iterator[Tuple[int, 'np.ndarray']]:
+    """
+    The bounding box of the coordinates, a few rows at a time: first
+    row of the tile and index of the nearest coordinate to every cell
+    (-1 where two or more are the nearest).
+    """
+    xs = [x for x, y in coords]
+    ys = [y for x, y in coords]
+    columns = np.arange(min(xs), max(xs) + 1, dtype=np.int32)
+    rows = max(1, tile_cells // len(columns))
+    for top in range(min(ys), max(ys) + 1, rows):
+        lines = np.arange(top, min(top + rows, max(ys) + 1), dtype=np.int32)
+        shape = (len(lines), len(columns))
+        nearest = np.zeros(shape, dtype=np.int32)
+        best = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        distance = np.empty(shape, dtype=np.int32)
+        mask = np.empty(shape, dtype=bool)
+        for i, (x, y) in enumerate(coords):
+            np.add(np.abs(lines - y)[:, np.newaxis], np.abs(columns - x), out=distance)
+            np.equal(distance, best, out=mask)
+            nearest[mask] = -1
+            np.less(distance, best, out=mask)
+            nearest[mask] = i
+            np.minimum(best, distance, out=best)
+        yield top, nearest
+
+
+def scan_tiles(coords: List[Tuple[int, int]]) -> Tuple[Dict[int, int], Set[int]]:
+    """
+    The areas of scan_field() with NumPy, tile by tile: areas and
+    coordinates with infinite areas by their index. The locations near
+    to all the coordinates are left to safe_region_size().
+    """
+    areas = np.zeros(len(coords), dtype=np.int64)
+    infinite = set()
+    bottom = max(y for x, y in coords)
+    for top, nearest in field_tiles(coords):
+        areas += np.bincount(nearest[nearest >= 0], minlength=len(coords))
+        border = [nearest[:, 0], nearest[:, -1]]
+        if top == min(y for x, y in coords):
+            border.append(nearest[0])
+        if top + len(nearest) - 1 == bottom:
+            border.append(nearest[-1])
+        infinite.update(np.unique(np.concatenate(border)).tolist())
+    infinite.discard(-1)
+    return dict(enumerate(areas.tolist())), infinite
+
+
+def part1(coords: List[Tuple[int, int]]) -> int:
+    if np is not None:
+        areas, infinite = scan_tiles(coords)
+        return max((area for i, area in areas.items() if i not in infinite), default=0)
+    areas, to_exclude, near_to_all = scan_field(coords)
+    max_area = 0
+    for area, locations in areas.items():
+        if area in to_exclude:
+            continue
+        if locations > max_area:
+            max_area = locations
+            max_area_name = area
+    return max_area
+
+
+def distance_sums(values: List[int], start: int, stop: int) -> List[int]:
+    """
+    Sum of the distances from all the values of every position in
+    range(start, stop), in one sweep: one step forward brings a position
+    nearer to the values ahead and farther from the others.
+    """
+    values = sorted(values)
+    behind = 0
+    total = sum(abs(start - value) for value in values)
+    sums = []
+    for position in range(start, stop):
+        while behind < len(values) and values[behind] <= position:
+            behind += 1
+        sums.append(total)
+        total += behind - (len(values) - behind)
+    return sums
 
 
-with open(
-        os.path.join(get_package_root(), 'input_day6.txt'),
-        encoding='utf-8'
-    ) as fh:
-    lines = [line.split(', ') for line in fh.read().split('\n') if line]
+def safe_region_size(coords: List[Tuple[int, int]], limit: int = SAFE_DISTANCE) -> int:
+    """
+    Locations with a sum of distances from all the coordinates below limit.
+    The sum splits into the sums along x and along y, so it's enough
+    to pair the two. Beyond the bounding box every step adds one per
+    coordinate, hence the margin around it.
+    """
+    xs = [x for x, y in coords]
+    ys = [y for x, y in coords]
+    margin = limit // len(coords) + 1
+    along_x = sorted(distance_sums(xs, min(xs) - margin, max(xs) + margin + 1))
+    along_y = sorted(distance_sums(ys, min(ys) - margin, max(ys) + margin + 1), reverse=True)
+    size = 0
+    too_far = 0  # the longest sums along y, too far with the rest along x
+    for x_sum in along_x:
+        while too_far < len(along_y) and x_sum + along_y[too_far] >= limit:
+            too_far += 1
+        size += len(along_y) - too_far
+    return size
 
-coords = [(int(x), int(y)) for (x, y) in lines]
-field = [ ['x'] * max((x for (x, y) in coords)) for n in range(max((y for (x, y) in coords)))]
 
-areas = { chr(i): 0 for i in range(0x41, 0x41+len(coords)) }
+def part2(coords: List[Tuple[int, int]]) -> int:
+    return safe_region_size(coords)
 
-to_exclude = []
-near_to_all = 0
-for px, row in enumerate(field):
-    for py, col in enumerate(row):
-        try:
-            nearest_coord, sum_of_distances = draw_point(field, coords)
-            if sum_of_distances < 10000:
-                near_to_all += 1
-            areas[nearest_coord] += 1
-        except KeyError:
-            pass
-        if px in (0, len(field)-1) or py in (0, len(row)-1):
-            to_exclude.append(nearest_coord)
 
-max_area = 0
-for area, locations in areas.items():
-    if area in to_exclude:
-        continue
-    if locations > max_area:
-        max_area = locations
-        max_area_name = area
+if __name__ == '__main__':
+    coords = parse()
 
-print("Max non infinite area is", max_area, "big.")
+    print("Max non infinite area is", part1(coords), "big.")
 
-print("Number of locations within 10000 from all coords:", near_to_all)
+    print("Number of locations within 10000 from all coords:", part2(coords))
@@ -2,100 +2,197 @@
 # -*- coding: utf-8 -*-
 
 
+import functools
+import heapq
 import os
+import re
+import sys
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+from aoc.parallel import pool_map
+
+
+REQUIREMENT = re.compile(r'Step (\S+) must be finished before step (\S+) can begin')
+WORKERS = 5
 
 
 class Step(object):
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, seconds_to_accomplish: int) -> None:
         self.name = name
         self.blocked_from = []
         self.blocking = []
-        self.seconds_to_accomplish = 60 + ord(name) - 0x40
-
-
-with open(
-        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day7.txt'),
-        encoding='utf-8'
-    ) as fh:
-    lines = [line for line in fh.read().split('\n') if line]
-
-steps = {}
-for line in lines:
-    blocking = line[5]
-    blocked = line[-12]
-    try:
-        blocking_step = steps[blocking]
-    except KeyError:
-        blocking_step = Step(blocking)
-        steps[blocking] = blocking_step
-    try:
-        blocked_step = steps[blocked]
-    except KeyError:
-        blocked_step = Step(blocked)
-        steps[blocked] = blocked_step
-    blocking_step.blocking.append(blocked_step)
-    blocked_step.blocked_from.append(blocking_step)
-
-tot_steps = len(steps)
-unaccomplished_steps = [ step for step in steps.values() ]
-accomplished_steps = []
-working_steps = []
-free_workers = 5
-time = 0
-
-# Solution to the first test:
-#
-# tot_steps = len(unaccomplished_steps)
-# while len(accomplished_steps) < tot_steps:
-#     next_step = None
-#     for step in unaccomplished_steps:
-#         candidate = True
-#         for blocking in step.blocked_from:
-#             if blocking in unaccomplished_steps:
-#                 candidate = False
-#         if candidate:
-#             try:
-#                 if ord(next_step.name) > ord(step.name):
-#                     next_step = step
-#             except AttributeError:
-#                 next_step = step
-#     accomplished_steps.append(next_step)
-#     unaccomplished_steps.remove(next_step)
-
-# print("Order of steps:", "".join(step.name for step in accomplished_steps))
-
-while len(accomplished_steps) < tot_steps:
-    next_steps = []
-    for step in unaccomplished_steps:
-        candidate = True
+        self.seconds_to_accomplish = seconds_to_accomplish
+
+
+class Plan(NamedTuple):
+    makespan: int
+    order: List[str]  # in which the steps are started
+    timeline: List[List[Tuple[int, int, str]]]  # (start, end, step) of every worker
+    critical_path: List[str]
+
+
+def letter_duration(name: str) -> int:
+    """
+    60 seconds plus the position of the name in the alphabet:
+    only for steps named by a single uppercase letter.
+    """
+    if len(name) != 1 or not 'A' <= name <= 'Z':
+        raise ValueError(f"No duration for step {name!r}: not an uppercase letter.")
+    return 60 + ord(name) - 0x40
+
+
+def unit_duration(name: str) -> int:
+    return 1
+
+
+def parse(path: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Pairs of (blocking, blocked) step names.
+    """
+    with MappedInput(path or input_path(__file__)) as input_:
+        return REQUIREMENT.findall(input_.text())
+
+
+def build_steps(
+        requirements: Iterable[Tuple[str, str]],
+        duration: Callable[[str], int] = letter_duration
+) -> Dict[str, Step]:
+    steps = {}
+    for blocking, blocked in requirements:
+        try:
+            blocking_step = steps[blocking]
+        except KeyError:
+            blocking_step = Step(blocking, duration(blocking))
+            steps[blocking] = blocking_step
+        try:
+            blocked_step = steps[blocked]
+        except KeyError:
+            blocked_step = Step(blocked, duration(blocked))
+            steps[blocked] = blocked_step
+        blocking_step.blocking.append(blocked_step)
+        blocked_step.blocked_from.append(blocking_step)
+    return steps
+
+
+def critical_path(steps: Dict[str, Step], order: List[str]) -> List[str]:
+    """
+    Longest chain of steps blocking each other, by duration: no number
+    of workers accomplishes them all in less time. order must start
+    every step after the ones blocking it.
+    """
+    finish = {}
+    previous = {}
+    for name in order:
+        step = steps[name]
+        start = 0
         for blocking in step.blocked_from:
-            if blocking in unaccomplished_steps or blocking in working_steps:
-                candidate = False
-        if candidate:
-            added = False
-            for i, s in enumerate(next_steps):
-                if ord(s.name) > ord(step.name):
-                    next_steps = next_steps[:i] + [step] + next_steps[i:]
-                    added = True
-                    break
-            if not added:
-                next_steps.append(step)
-
-    for step in next_steps:
-        if free_workers:
-            working_steps.append(step)
-            unaccomplished_steps.remove(step)
-            free_workers -= 1
-    offset = 0
-    for i in range(len(working_steps)):
-        work = working_steps[i-offset]
-        work.seconds_to_accomplish -= 1
-        if not work.seconds_to_accomplish:
-            accomplished_steps.append(work)
-            working_steps.remove(work)
-            free_workers += 1
-            offset += 1
-    time += 1
-
-print("Time to accomplish all the steps for 5 workers:", time)
+            if finish[blocking.name] > start:
+                start = finish[blocking.name]
+                previous[name] = blocking.name
+        finish[name] = start + step.seconds_to_accomplish
+    name = max(finish, key=finish.get, default=None)
+    path = []
+    while name is not None:
+        path.append(name)
+        name = previous.get(name)
+    return path[::-1]
+
+
+def schedule(steps: Dict[str, Step], workers: int) -> Plan:
+    """
+    How workers accomplish the steps, starting the ready ones in
+    order of name. Every step waits for the number of its blocking
+    steps still unaccomplished to reach zero, then in a heap of ready
+    steps by name; the time jumps from one completion to the next in
+    the heap of the working steps by end time.
+    """
+    if workers < 1:
+        raise ValueError(f"Can't accomplish the steps with {workers} workers.")
+    blocking_left = {name: len(step.blocked_from) for name, step in steps.items()}
+    ready = [name for name, left in blocking_left.items() if not left]
+    heapq.heapify(ready)
+    free = list(range(workers))
+    working = []
+    order = []
+    timeline = [[] for n in range(workers)]
+    time = 0
+    while ready or working:
+        while ready and free:
+            name = heapq.heappop(ready)
+            worker = heapq.heappop(free)
+            end = time + steps[name].seconds_to_accomplish
+            order.append(name)
+            timeline[worker].append((time, end, name))
+            heapq.heappush(working, (end, name, worker))
+        time, name, worker = heapq.heappop(working)
+        accomplished = [(name, worker)]
+        while working and working[0][0] == time:
+            accomplished.append(heapq.heappop(working)[1:])
+        for name, worker in accomplished:
+            heapq.heappush(free, worker)
+            for blocked in steps[name].blocking:
+                blocking_left[blocked.name] -= 1
+                if not blocking_left[blocked.name]:
+                    heapq.heappush(ready, blocked.name)
+    if len(order) < len(steps):
+        raise ValueError("The requirements have a cycle.")
+    return Plan(time, order, timeline, critical_path(steps, order))
+
+
+def makespan(
+        requirements: Sequence[Tuple[str, str]],
+        workers: int,
+        duration: Callable[[str], int] = letter_duration
+) -> int:
+    return schedule(build_steps(requirements, duration), workers).makespan
+
+
+def sweep_workers(
+        requirements: Sequence[Tuple[str, str]],
+        worker_counts: Iterable[int],
+        duration: Callable[[str], int] = letter_duration
+) -> Dict[int, int]:
+    """
+    Time to accomplish the steps for every number of workers, scheduled
+    in parallel (duration must be picklable, e.g. a module-level function).
+    """
+    worker_counts = list(worker_counts)
+    task = functools.partial(_makespan_for, requirements, duration)
+    return dict(zip(worker_counts, pool_map(task, worker_counts)))
+
+
+def _makespan_for(
+        requirements: Sequence[Tuple[str, str]],
+        duration: Callable[[str], int],
+        workers: int
+) -> int:
+    return makespan(requirements, workers, duration)
+
+
+def part1(requirements: List[Tuple[str, str]]) -> str:
+    # with one worker, steps are started in the order they are
+    # accomplished, whatever they last
+    return "".join(schedule(build_steps(requirements, unit_duration), 1).order)
+
+
+def part2(
+        requirements: List[Tuple[str, str]],
+        duration: Callable[[str], int] = letter_duration
+) -> int:
+    return makespan(requirements, WORKERS, duration)
+
+
+if __name__ == '__main__':
+    requirements = parse()
+
+    print("Order of steps:", part1(requirements))
+
+    print(f"Time to accomplish all the steps for {WORKERS} workers:", part2(requirements))
+
+    plan = schedule(build_steps(requirements), WORKERS)
+    print("Critical path:", "".join(plan.critical_path))
+    for workers, seconds in sweep_workers(requirements, range(1, 2 * WORKERS + 1)).items():
+        print(f"{workers:>3} workers: {seconds} seconds")
@@ -2,65 +2,151 @@
 # -*- coding: utf-8 -*-
 
 
+import itertools
 import os
+import sys
+from array import array
+from typing import Iterable, Optional
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
 
-class Node:
-
-    def __init__(self, children: int, metadata: int) -> None:
-        self.num_children = children
-        self.num_metadata = metadata
-        self.children = []
-        self.metadata = []
-
-    def sum_metadata(self):
-        if not self.children:
-            return sum(self.metadata)
-        sum_meta = 0
-        for child in self.children:
-            sum_meta += child.sum_metadata()
-        return sum(self.metadata) + sum_meta
-
-    def value(self):
-        if not self.children:
-            return sum(self.metadata)
-        value = 0
-        for i in self.metadata:
-            if i:
-                try:
-                    value += self.children[i-1].value()
-                except IndexError:
-                    pass
-        return value
-
-
-def parse_node(sequence: list, root: Node = None, father: Node = None, index: int = 0):
-    if index >= len(sequence) - 2:
-        return root, index
-    else:
-        child = Node(sequence[index], sequence[index+1])
-        if not root:
-            root = child
-        if not father:
-            father = child
+
+class Tree:
+    """
+    License tree in parallel arrays indexed by node number, nodes being
+    numbered in the order they appear in the input (preorder). The
+    children of every node are a slice of children, its metadata a slice
+    of metadata (stored in postorder, as they appear in the input), so the
+    metadata of a whole subtree is a slice too, starting at subtree_start.
+    Values and sums of metadata are computed once the tree is complete
+    (see index), then just looked up.
+    """
+
+    def __init__(self) -> None:
+        self.child_start = array('i')
+        self.child_count = array('i')
+        self.children = array('i')
+        self.meta_start = array('i')
+        self.meta_count = array('i')
+        self.subtree_start = array('i')
+        self.metadata = array('q')
+        self.postorder = array('i')
+        self._values = None
+        self._metadata_sums = None
+
+    def __len__(self) -> int:
+        return len(self.child_count)
+
+    def add_node(self, children: int, metadata: int) -> int:
+        self.child_start.append(len(self.children))
+        self.child_count.append(children)
+        self.children.extend(array('i', bytes(4 * children)))
+        self.meta_start.append(0)  # known once its children are read
+        self.meta_count.append(metadata)
+        self.subtree_start.append(len(self.metadata))
+        self._values = self._metadata_sums = None
+        return len(self) - 1
+
+    def index(self) -> None:
+        """
+        Compute the tables looked up by sum_metadata and value; adding
+        a node drops them, so they're computed from scratch if not indexed.
+        """
+        self._metadata_sums = self.metadata_sums()
+        self._values = self.values()
+
+    def sum_metadata(self, node: int = 0) -> int:
+        """
+        Sum of the metadata of the subtree under node (the whole tree by default).
+        """
+        sums = self._metadata_sums
+        if sums is None:
+            sums = self.metadata_sums()
+        end = self.meta_start[node] + self.meta_count[node]
+        return sums[end] - sums[self.subtree_start[node]]
+
+    def value(self, node: int = 0) -> int:
+        if self._values is None:
+            return self.values()[node]
+        return self._values[node]
+
+    def metadata_sums(self) -> array:
+        """
+        Prefix sums of the metadata.
+        """
+        return array('q', itertools.accumulate(self.metadata, initial=0))
+
+    def values(self) -> array:
+        """
+        Value of every node, computed bottom-up: every node comes after
+        its children in postorder, so each value is computed once however
+        many times the metadata refer to it.
+        """
+        values = array('q', bytes(8 * len(self)))
+        children = self.children
+        metadata = self.metadata
+        for node in self.postorder:
+            start = self.meta_start[node]
+            entries = metadata[start:start+self.meta_count[node]]
+            count = self.child_count[node]
+            if not count:
+                values[node] = sum(entries)
+                continue
+            first = self.child_start[node] - 1
+            values[node] = sum(values[children[first+i]] for i in entries if 0 < i <= count)
+        return values
+
+
+def parse_tree(numbers: Iterable[int]) -> Tree:
+    """
+    Tree serialized in numbers, read lazily in one pass. The stack holds
+    the nodes whose children are still being read, innermost on top,
+    with the number of children read so far.
+    """
+    tree = Tree()
+    numbers = iter(numbers)
+
+    def read_node() -> int:
+        try:
+            return tree.add_node(next(numbers), next(numbers))
+        except StopIteration:
+            raise ValueError("truncated license tree") from None
+
+    stack = [[read_node(), 0]]
+    while stack:
+        top = stack[-1]
+        node, read = top
+        if read < tree.child_count[node]:
+            child = read_node()
+            tree.children[tree.child_start[node] + read] = child
+            top[1] += 1
+            stack.append([child, 0])
         else:
-            father.children.append(child)
-        index += 2
-        for n in range(child.num_children):
-            root, index = parse_node(sequence, root, child, index)
-        for n in range(child.num_metadata):
-            child.metadata.append(sequence[index])
-            index += 1
-        return root, index
+            tree.meta_start[node] = len(tree.metadata)
+            tree.metadata.extend(itertools.islice(numbers, tree.meta_count[node]))
+            if len(tree.metadata) - tree.meta_start[node] < tree.meta_count[node]:
+                raise ValueError("truncated license tree")
+            tree.postorder.append(node)
+            stack.pop()
+    tree.index()
+    return tree
+
+
+def parse(path: Optional[str] = None) -> Tree:
+    with MappedInput(path or input_path(__file__)) as input_:
+        return parse_tree(input_.ints())
+
+
+def part1(tree: Tree) -> int:
+    return tree.sum_metadata()
+
+
+def part2(tree: Tree) -> int:
+    return tree.value()
 
 
 if __name__ == '__main__':
-    with open(
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input_day8.txt'),
-            encoding='utf-8'
-        ) as fh:
-        numbers = [int(num) for num in fh.read().split() if num]
-
-    root, _ = parse_node(numbers)
-    print("Sum of metadata is", root.sum_metadata())
-    print("Value of the root node is", root.value())
+    tree = parse()
+    print("Sum of metadata is", part1(tree))
+    print("Value of the root node is", part2(tree))
@@ -2,79 +2,128 @@
 # -*- coding: utf-8 -*-
 
 
-class Player:
-
-    def __init__(self, id_: int) -> None:
-        self.id = id_
-        self.score = 0
-
-
-class Marble:
-
-    def __init__(self, value: int) -> None:
-        self.value = value
-        self.next_marble = self
-        self.prev_marble = self
-
-    def insert(self, marble: 'Marble', offset: int = 0) -> None:
-        m = self
-        if offset >= 0:
-            for n in range(offset):
-                m = m.next_marble
-        elif offset < 0:
-            for n in range(-offset):
-                m = m.prev_marble
-        marble.next_marble = m.next_marble
-        marble.prev_marble = m
-        m.next_marble.prev_marble = marble
-        m.next_marble = marble
-    
-    def remove(self, offset: int = 0) -> 'Marble':
-        m = self
-        if offset >= 0:
-            for n in range(offset):
-                m = m.next_marble
-        elif offset < 0:
-            for n in range(-offset):
-                m = m.prev_marble
-        m.prev_marble.next_marble = m.next_marble
-        m.next_marble.prev_marble = m.prev_marble
-        return m
+import os
+import sys
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput, input_path
+from aoc.parallel import pool_map
 
 
 class Game:
+    """
+    The circle of marbles is kept in two arrays indexed by marble value,
+    holding the values of the next and of the previous marble, and the
+    scores in a third one indexed by player.
+    """
 
     def __init__(self, players: int, last_marble: int) -> None:
         self.last_marble = last_marble
-        self.players = [Player(n) for n in range(players)]
-        self.current_player = 0
-        self.current_marble: Marble
-
-    def play_game(self) -> Player:
-        self.current_marble = Marble(0)
-        for marble in range(1, self.last_marble+1):
-            self.round(marble)
-        return max(self.players, key=lambda p: p.score)
-
-    def round(self, marble_value: int) -> None:
-        if marble_value % 23:
-            new_marble = Marble(marble_value)
-            self.current_marble.insert(new_marble, 1)
-            self.current_marble = new_marble
-        else:
-            other_marble = self.current_marble.remove(-7)
-            self.players[self.current_player].score += marble_value + other_marble.value
-            self.current_marble = other_marble.next_marble
-        self.current_player += 1
-        if self.current_player >= len(self.players):
-            self.current_player = 0
+        self.scores = array('Q', [0]) * players
+        self.next_marble = array('I', [0]) * (last_marble + 1)
+        self.prev_marble = array('I', [0]) * (last_marble + 1)
+        self.current_marble = 0
+        self.played = 0
+
+    def play_game(self) -> int:
+        """
+        Score of the winning player.
+        """
+        return self.play(self.last_marble)
+
+    def play(self, last_marble: int) -> int:
+        """
+        Go on playing up to last_marble (at most the one the game was
+        created for) and return the score of the winning player so far:
+        the same as a game ending with last_marble.
+        """
+        if not self.played <= last_marble <= self.last_marble:
+            raise ValueError(f"Can't play from marble {self.played} to {last_marble}.")
+        next_marble = self.next_marble
+        prev_marble = self.prev_marble
+        scores = self.scores
+        players = len(scores)
+        current = self.current_marble
+        for marble in range(self.played+1, last_marble+1):
+            if marble % 23:
+                left = next_marble[current]
+                right = next_marble[left]
+                next_marble[left] = marble
+                prev_marble[marble] = left
+                next_marble[marble] = right
+                prev_marble[right] = marble
+                current = marble
+            else:
+                removed = current
+                for n in range(7):
+                    removed = prev_marble[removed]
+                left = prev_marble[removed]
+                current = next_marble[removed]
+                next_marble[left] = current
+                prev_marble[current] = left
+                scores[(marble-1) % players] += marble + removed
+        self.current_marble = current
+        self.played = last_marble
+        return max(scores)
+
+
+def play_series(series: Tuple[int, List[int]]) -> List[int]:
+    """
+    Winning scores of the games of the same number of players ending
+    with each of the last marbles: the shorter games are just the
+    beginning of the longest one, so it is played only once.
+    """
+    players, last_marbles = series
+    game = Game(players, max(last_marbles, default=0))
+    scores = {}
+    for last_marble in sorted(set(last_marbles)):
+        scores[last_marble] = game.play(last_marble)
+    return [scores[last_marble] for last_marble in last_marbles]
+
+
+def play_batch(configs: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    Winning score of every (players, last_marble) configuration. The ones
+    with the same number of players share a game, and the games are
+    played in parallel, longest first.
+    """
+    series = {}
+    for players, last_marble in configs:
+        try:
+            series[players].append(last_marble)
+        except KeyError:
+            series[players] = [last_marble]
+    ordered = sorted(series.items(), key=lambda item: max(item[1]), reverse=True)
+    scores = {}
+    for (players, last_marbles), winning in zip(ordered, pool_map(play_series, ordered)):
+        scores.update(((players, last_marble), score) for last_marble, score in zip(last_marbles, winning))
+    return [scores[config] for config in configs]
+
+
+def parse(path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Number of players and value of the last marble.
+    """
+    with MappedInput(path or input_path(__file__)) as input_:
+        players, last_marble = input_.ints()
+    return players, last_marble
+
+
+def part1(config: Tuple[int, int]) -> int:
+    players, last_marble = config
+    return Game(players=players, last_marble=last_marble).play_game()
+
+
+def part2(config: Tuple[int, int]) -> int:
+    players, last_marble = config
+    return Game(players=players, last_marble=last_marble*100).play_game()
 
 
 if __name__ == '__main__':
-    game = Game(players=416, last_marble=71975)
-    winner = game.play_game()
-    print("Score of the winning player:", winner.score)
+    config = parse()
+
+    print("Score of the winning player:", part1(config))
 
-    game = Game(players=416, last_marble=7197500)
-    winner = game.play_game()
-    print("Score of the winning player:", winner.score)
+    print("Score of the winning player:", part2(config))
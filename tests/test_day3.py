@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'day3'))
+import day3
+
+
+def brute_force(squares):
+    inches = {}
+    for sq in squares:
+        for inch in sq.inches():
+            inches[inch] = inches.get(inch, 0) + 1
+    intact = [sq.id for sq in squares
+              if sq.width and sq.height and all(inches[inch] == 1 for inch in sq.inches())]
+    return sum(1 for n in inches.values() if n > 1), intact
+
+
+class SweepTest(unittest.TestCase):
+
+    def random_squares(self, rng, claims, size):
+        # small sizes make claims often empty, touching edges or corners
+        squares = []
+        for id_ in range(1, claims + 1):
+            squares.append(day3.Square(id_, rng.randrange(size), rng.randrange(size),
+                                       rng.randrange(4), rng.randrange(4)))
+        return squares
+
+    def test_examples(self) -> None:
+        squares = [day3.Square(1, 1, 3, 4, 4), day3.Square(2, 3, 1, 4, 4), day3.Square(3, 5, 5, 2, 2)]
+        self.assertEqual(day3.sweep(squares), (4, [3]))
+
+    def test_edges_touching(self) -> None:
+        squares = [day3.Square(1, 0, 0, 2, 2), day3.Square(2, 2, 0, 2, 2),
+                   day3.Square(3, 0, 2, 2, 2), day3.Square(4, 2, 2, 0, 3)]
+        self.assertEqual(day3.sweep(squares), (0, [1, 2, 3]))
+
+    def test_against_brute_force(self) -> None:
+        rng = random.Random(3)
+        for n in range(500):
+            squares = self.random_squares(rng, rng.randrange(1, 10), 8)
+            self.assertEqual(day3.sweep(squares), brute_force(squares), [vars(sq) for sq in squares])
+
+    @unittest.skipIf(day3.np is None, "NumPy isn't installed")
+    def test_against_dense(self) -> None:
+        rng = random.Random(11)
+        for n in range(500):
+            squares = self.random_squares(rng, rng.randrange(1, 10), 8)
+            claims = day3.claims_array(squares)
+            fabric = day3.coverage(claims)
+            intact = [sq.id for sq, ok in zip(squares, day3.intact_claims(claims, fabric))
+                      if ok and sq.width and sq.height]
+            area, swept = day3.sweep(squares)
+            self.assertEqual(area, int((fabric > 1).sum()), [vars(sq) for sq in squares])
+            self.assertEqual(swept, intact, [vars(sq) for sq in squares])
+
+
+if __name__ == '__main__':
+    unittest.main()
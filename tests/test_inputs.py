@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.inputs import MappedInput
+
+
+class MappedInputTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(b'.#.\n#.#\n-12\n')
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def test_lines_and_ints(self) -> None:
+        with MappedInput(self.path) as input_:
+            self.assertEqual(list(input_.lines()), ['.#.', '#.#', '-12'])
+            self.assertEqual(list(input_.ints()), [-12])
+
+    def test_views_outlive_close(self) -> None:
+        with MappedInput(self.path) as input_:
+            row = input_.grid()[1]
+            lines = list(input_.byte_lines())
+        self.assertTrue(input_.closed)
+        self.assertEqual(bytes(row), b'#.#')
+        self.assertEqual([bytes(line) for line in lines], [b'.#.', b'#.#', b'-12'])
+
+    def test_close_without_views(self) -> None:
+        input_ = MappedInput(self.path)
+        input_.close()
+        self.assertTrue(input_.closed)
+        input_.close()
+
+    def test_empty_file(self) -> None:
+        with open(self.path, 'wb'):
+            pass
+        with MappedInput(self.path) as input_:
+            self.assertEqual(list(input_.lines()), [])
+        self.assertTrue(input_.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()